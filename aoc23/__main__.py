@@ -1,34 +1,396 @@
-import argparse
-from importlib import import_module
-from typing import Optional
+import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple
 
-from aoc23.utils import get_input
+# Flag -> keyword argument of run_day
+simple_flags = {
+    "--strip": "strip",
+    "--no-cache": "no_cache",
+    "--refresh": "refresh",
+    "--parse-cache": "parse_cache",
+    "--stream": "stream",
+    "--mmap": "mmap",
+}
+
+
+def parse_simple_args(argv: List[str]) -> Optional[Dict[str, Any]]:
+    # Fast path for the common `--day DAY [--example EXAMPLE] [--strip]` form, so
+    # scripts calling the CLI do not pay for importing argparse. Anything else is
+    # left to argparse
+    day: Optional[int] = None
+    example: Optional[int] = None
+    kwargs: Dict[str, Any] = {}
+    index = 0
+    while index < len(argv):
+        arg = argv[index]
+        if arg in simple_flags:
+            kwargs[simple_flags[arg]] = True
+            index += 1
+            continue
+        if arg not in ("--day", "--example") or index + 1 == len(argv):
+            return None
+        value = argv[index + 1]
+        if not value.isdigit():
+            return None
+        if arg == "--day":
+            day = int(value)
+        else:
+            example = int(value)
+        index += 2
+
+    if day is None:
+        return None
+    return {"day": day, "example": example, **kwargs}
+
+
+def parse_args(argv: List[str]) -> Any:
+    import argparse
 
-if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument(
+    days_group = parser.add_mutually_exclusive_group(required=True)
+    days_group.add_argument(
         "--day",
         type=int,
         help="The day number to run",
-        required=True,
+    )
+    days_group.add_argument(
+        "--days",
+        type=str,
+        help="The days to run in parallel, i.e. 1-12,17",
+    )
+    days_group.add_argument(
+        "--all",
+        action="store_true",
+        help="Run all days in parallel",
     )
     parser.add_argument(
         "--example",
         type=int,
         help="The example number to run",
     )
+    parser.add_argument(
+        "--input",
+        type=str,
+        help="Solve this file, or every file in a directory or matching a glob",
+    )
     parser.add_argument(
         "--strip",
         action="store_true",
         help="If content should be stripped",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--parallel-parts",
+        action="store_true",
+        help="Run part 1 and part 2 concurrently in separate processes",
+    )
+    parser.add_argument(
+        "--time",
+        action="store_true",
+        help="Print the wall time of each stage",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not look up or store the answers in the answer cache",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Recompute the answers even if they are cached",
+    )
+    parser.add_argument(
+        "--parse-cache",
+        action="store_true",
+        help="Look up and store the parsed input in the parsed input cache",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the lines of the input to the parser",
+    )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="Memory map the input for days that can parse it as bytes",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile parse and each part separately",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=str,
+        help="Where to write the .pstats files, defaults to the cache directory",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="The number of functions or allocation sites to show",
+    )
+    parser.add_argument(
+        "--collapsed",
+        type=str,
+        help="Write collapsed stacks for flamegraph tools to this file when profiling",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Report the peak memory and top allocation sites of each stage",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=float,
+        help="Abort a day when its address space exceeds this many MiB",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Count the work done in hot paths, such as states expanded, and print it",
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        help="Write the timed spans of the run to this file as Chrome trace JSON",
+    )
+    parser.add_argument(
+        "--gc-freeze",
+        action="store_true",
+        help="Freeze the parsed input with gc.freeze before running the parts",
+    )
+    gc_group = parser.add_mutually_exclusive_group()
+    gc_group.add_argument(
+        "--gc-disable",
+        action="store_true",
+        help="Run the parts with the cyclic garbage collector disabled",
+    )
+    gc_group.add_argument(
+        "--gc-threshold",
+        type=str,
+        help="Run the parts with these GC thresholds, i.e. 50000,20,20",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="The number of worker processes when running multiple days or inputs",
+    )
+    parser.add_argument(
+        "--part-workers",
+        type=int,
+        help="The number of worker processes parts that support it split work over",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        help="The number of inputs sent to a worker at a time when running many inputs",
+    )
+    args = parser.parse_args(argv)
+    args.gc_thresholds = None
+    if args.gc_threshold is not None:
+        from aoc23.garbage import parse_thresholds
+
+        try:
+            args.gc_thresholds = parse_thresholds(args.gc_threshold)
+        except ValueError as error:
+            parser.error(f"--gc-threshold: {error}")
+    if args.memory_limit is not None:
+        from aoc23.memory import MEBIBYTE, MIN_HEADROOM, address_space
+
+        # Below that, even reporting the MemoryError runs out of memory
+        minimum = (address_space() + MIN_HEADROOM) / MEBIBYTE
+        if args.memory_limit < minimum:
+            parser.error(f"--memory-limit must be at least {minimum:.0f}MiB")
+    if args.input is not None and args.day is None:
+        parser.error("--input can only be used with --day")
+    if args.stats and (args.day is None or args.parallel_parts):
+        # Counters are collected in this process only
+        parser.error("--stats can only be used with --day, without --parallel-parts")
+    if args.trace and (args.day is None or args.parallel_parts):
+        # So are spans
+        parser.error("--trace can only be used with --day, without --parallel-parts")
+    return args
+
+
+def run_day(
+    day: int,
+    example: Optional[int],
+    strip: bool = False,
+    parallel_parts: bool = False,
+    show_time: bool = False,
+    no_cache: bool = False,
+    refresh: bool = False,
+    parse_cache: bool = False,
+    stream: bool = False,
+    mmap: bool = False,
+    input_file: Optional[str] = None,
+    gc_freeze: bool = False,
+    gc_disable: bool = False,
+    gc_thresholds: Optional[Tuple[int, ...]] = None,
+) -> None:
+    from aoc23.runner import Options, format_answers, format_timings, solve_cached
+
+    options = Options(
+        example=example,
+        strip=strip,
+        parallel_parts=parallel_parts,
+        use_cache=not no_cache,
+        refresh=refresh,
+        parse_cache=parse_cache,
+        stream=stream,
+        mmap=mmap,
+        input_file=input_file,
+        gc_freeze=gc_freeze,
+        gc_disable=gc_disable,
+        gc_thresholds=gc_thresholds,
+    )
+    answers, timings = solve_cached(day, options)
+    print(format_answers(answers), end="")
+    if show_time:
+        print(format_timings(timings))
+
+
+if __name__ == "__main__":
+    # Subcommands for the solver server, they have their own arguments
+    if sys.argv[1:2] == ["serve"]:
+        from aoc23.server import main
+
+        main(sys.argv[2:])
+        sys.exit(0)
+    if sys.argv[1:2] == ["client"]:
+        from aoc23.client import main
+
+        main(sys.argv[2:])
+        sys.exit(0)
+
+    simple_args = parse_simple_args(sys.argv[1:])
+    if simple_args is not None:
+        run_day(**simple_args)
+        sys.exit(0)
+
+    args = parse_args(sys.argv[1:])
+    if args.part_workers is not None:
+        # An environment variable, so it reaches the days run in worker processes
+        os.environ["AOC23_PART_WORKERS"] = str(args.part_workers)
+
+    if args.day is None:
+        from aoc23.registry import DAYS
+        from aoc23.runner import Options, parse_days, run_days
+
+        days: List[int] = list(DAYS) if args.all else parse_days(args.days)
+        options = Options(
+            example=args.example,
+            strip=args.strip,
+            parallel_parts=args.parallel_parts,
+            use_cache=not args.no_cache,
+            refresh=args.refresh,
+            parse_cache=args.parse_cache,
+            stream=args.stream,
+            mmap=args.mmap,
+            gc_freeze=args.gc_freeze,
+            gc_disable=args.gc_disable,
+            gc_thresholds=args.gc_thresholds,
+        )
+        success = run_days(days, options, args.workers, args.memory_limit)
+        sys.exit(0 if success else 1)
+
+    if args.input is not None and not os.path.isfile(args.input):
+        from aoc23.batch import find_inputs, run_batch
+
+        paths = find_inputs(args.input)
+        if not paths:
+            sys.exit(f"No inputs found for {args.input}")
+        success = run_batch(args.day, paths, args.strip, args.workers, args.chunk_size)
+        sys.exit(0 if success else 1)
+
+    from aoc23.utils import input_path
+
+    path = args.input or input_path(args.day, args.example)
+
+    if args.profile:
+        from aoc23.profiling import profile_day
+        from aoc23.runner import format_answers
+        from aoc23.utils import cache_directory, get_file_input
+
+        answers = profile_day(
+            args.day,
+            get_file_input(path, args.strip),
+            args.profile_dir or f"{cache_directory()}/profiles",
+            args.top,
+            args.collapsed,
+        )
+        print(format_answers(answers), end="")
+        sys.exit(0)
+
+    if args.memory_limit is not None:
+        from aoc23.memory import set_memory_limit
+
+        set_memory_limit(args.memory_limit)
+
+    try:
+        if args.memory:
+            from aoc23.memory import measure_day
+            from aoc23.runner import format_answers
+            from aoc23.utils import get_file_input
+
+            answers = measure_day(args.day, get_file_input(path, args.strip), args.top)
+            print(format_answers(answers), end="")
+            sys.exit(0)
+
+        if args.stats or args.trace:
+            from aoc23.runner import Options, format_answers, format_timings, solve
+            from aoc23.utils import (
+                counters,
+                enable_counters,
+                enable_tracing,
+                get_file_input,
+                write_trace,
+            )
 
-    day: int = args.day
-    example: Optional[int] = args.example
-    strip: bool = args.strip
+            # The answer cache is bypassed, cached answers have nothing to count
+            # or trace
+            enable_counters(args.stats)
+            enable_tracing(args.trace is not None)
+            options = Options(
+                gc_freeze=args.gc_freeze,
+                gc_disable=args.gc_disable,
+                gc_thresholds=args.gc_thresholds,
+            )
+            lines = get_file_input(path, args.strip)
+            answers, timings = solve(args.day, lines, options)
+            print(format_answers(answers), end="")
+            if args.time:
+                print(format_timings(timings))
+            for name, value in sorted(counters.items()):
+                print(f"{name}: {value:,}")
+            if args.trace:
+                write_trace(args.trace)
+            sys.exit(0)
 
-    input = get_input(day, example, strip)
+        run_day(
+            args.day,
+            args.example,
+            args.strip,
+            args.parallel_parts,
+            args.time,
+            args.no_cache,
+            args.refresh,
+            args.parse_cache,
+            args.stream,
+            args.mmap,
+            args.input,
+            args.gc_freeze,
+            args.gc_disable,
+            args.gc_thresholds,
+        )
+    except (MemoryError, SystemError) as exception:
+        from aoc23.memory import out_of_memory, release_reserve
 
-    module = import_module(f"aoc23.day{day}.solution")
-    module.main(input)
+        if args.memory_limit is None or not out_of_memory(exception):
+            raise
+        release_reserve()
+        print(
+            f"Day {args.day} exceeded the memory limit of {args.memory_limit}MiB",
+            file=sys.stderr,
+        )
+        sys.exit(1)
@@ -0,0 +1,74 @@
+import glob
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from aoc23.registry import load_solver
+from aoc23.runner import solve
+from aoc23.utils import get_file_input
+
+# (input path, answers, stage timings) or (input path, error)
+BatchResult = Dict[str, Any]
+
+
+def find_inputs(pattern: str) -> List[str]:
+    # A file, every file in a directory, or every file matching a glob
+    if os.path.isdir(pattern):
+        paths = [entry.path for entry in os.scandir(pattern) if entry.is_file()]
+    else:
+        paths = [path for path in glob.glob(pattern) if os.path.isfile(path)]
+    return sorted(paths)
+
+
+def solve_files(day: int, paths: List[str], strip: bool) -> List[BatchResult]:
+    results: List[BatchResult] = []
+    for path in paths:
+        try:
+            answers, timings = solve(day, get_file_input(path, strip))
+            results.append({"input": path, "answers": answers, "timings": timings})
+        except Exception as exception:
+            results.append({"input": path, "error": repr(exception)})
+    return results
+
+
+def run_batch(
+    day: int,
+    paths: List[str],
+    strip: bool = False,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> bool:
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    workers = workers or os.cpu_count() or 1
+    # A few chunks per worker, so a worker does not pay for a round trip per input,
+    # while the slowest chunk still does not stretch the total much
+    if chunk_size is None:
+        chunk_size = max(1, len(paths) // (workers * 4))
+    chunks = [paths[i : i + chunk_size] for i in range(0, len(paths), chunk_size)]
+
+    failed = 0
+    start = time.perf_counter()
+    # Every worker imports the solution once, up front
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=load_solver, initargs=(day,)
+    ) as executor:
+        futures = [executor.submit(solve_files, day, chunk, strip) for chunk in chunks]
+        # Results are streamed as JSON lines, in the order they complete
+        for future in as_completed(futures):
+            for result in future.result():
+                failed += "error" in result
+                sys.stdout.write(json.dumps(result, default=str) + "\n")
+            sys.stdout.flush()
+    wall = time.perf_counter() - start
+
+    # The summary goes to stderr, so stdout only has the results
+    throughput = len(paths) / wall if wall > 0 else 0.0
+    print(
+        f"{len(paths)} inputs ({failed} failed) in {wall:.3f}s with {workers} workers: "
+        f"{throughput:.1f} inputs/s",
+        file=sys.stderr,
+    )
+    return failed == 0
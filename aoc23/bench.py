@@ -0,0 +1,285 @@
+import argparse
+import gc
+import glob
+import json
+import math
+import os
+import re
+import sys
+import time
+from statistics import median
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aoc23.registry import DAYS, get_parts, load_solver, solver_version
+from aoc23.runner import parse_days
+from aoc23.utils import cache_directory, cached_parse, directory, get_input, new_run
+
+# (stage name, untimed setup creating the argument from the lines, timed function)
+Stage = Tuple[str, Callable[[List[str]], Any], Callable[[Any], Any]]
+# (min, median, p95) in seconds
+Summary = Tuple[float, float, float]
+Results = Dict[str, Summary]
+# Left out of the default days, as a single run takes minutes
+SLOW_DAYS = {23}
+# The bounds of the number of timed runs chosen from the time budget
+MIN_REPEAT = 5
+MAX_REPEAT = 1000
+
+
+def get_inputs(day: int, inputs: str) -> List[Tuple[str, Optional[int]]]:
+    result: List[Tuple[str, Optional[int]]] = []
+    if inputs in ("examples", "all"):
+        examples = glob.glob(f"{directory}/day{day}/example*.txt")
+        numbers = sorted(
+            int(match.group(1))
+            for example in examples
+            if (match := re.search(r"example(\d+)\.txt$", example))
+        )
+        result.extend((f"example{number}", number) for number in numbers)
+    if inputs in ("problem", "all") and os.path.exists(
+        f"{directory}/day{day}/problem.txt"
+    ):
+        result.append(("problem", None))
+    return result
+
+
+def get_stages(module: ModuleType, version: Optional[str] = None) -> List[Stage]:
+    # Parts do not mutate the parsed input, so it can be parsed once up front. With
+    # a version, the parsed input is taken from the parsed input cache
+    parsed: Dict[int, Any] = {}
+
+    def parse_once(lines: List[str]) -> Any:
+        if id(lines) not in parsed:
+            parsed.clear()
+            parsed[id(lines)] = (
+                module.parse(lines)
+                if version is None
+                else cached_parse(module.parse, lines, version)
+            )
+        return parsed[id(lines)]
+
+    stages: List[Stage] = [("parse", list, module.parse)]
+    for part in get_parts(module):
+        stages.append((f"part{part}", parse_once, getattr(module, f"part{part}")))
+    return stages
+
+
+def time_stage(
+    setup: Callable[[List[str]], Any],
+    function: Callable[[Any], Any],
+    lines: List[str],
+    warmup: int,
+    repeat: Optional[int],
+    budget: float = 1.0,
+) -> Summary:
+    # Every call starts a new run, so parts compute the results they share with
+    # run_cached instead of finding those of an earlier call
+    estimate = 0.0
+    for _ in range(warmup):
+        argument = setup(lines)
+        new_run()
+        start = time.perf_counter()
+        function(argument)
+        estimate = time.perf_counter() - start
+    if repeat is None:
+        # As many runs as the last warmup says fit in the budget, so fast stages
+        # get enough runs for a stable minimum and slow ones are not run for ages
+        fitting = int(budget / estimate) if estimate > 0 else MIN_REPEAT
+        repeat = min(MAX_REPEAT, max(MIN_REPEAT, fitting))
+
+    timings: List[float] = []
+    gc_enabled = gc.isenabled()
+    try:
+        for _ in range(repeat):
+            argument = setup(lines)
+            new_run()
+            # Collect garbage from the previous run so it is not paid for in this one
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter()
+            function(argument)
+            timings.append(time.perf_counter() - start)
+            gc.enable()
+    finally:
+        if gc_enabled:
+            gc.enable()
+        else:
+            gc.disable()
+
+    timings.sort()
+    p95 = timings[math.ceil(0.95 * len(timings)) - 1]
+    return timings[0], median(timings), p95
+
+
+def bench_day(
+    day: int,
+    inputs: str,
+    warmup: int,
+    repeat: Optional[int],
+    budget: float,
+    strip: bool,
+    parse_cache: bool,
+) -> Tuple[Results, List[str]]:
+    results: Results = {}
+    errors: List[str] = []
+    module = load_solver(day)
+    stages = get_stages(module, solver_version(day) if parse_cache else None)
+    for input_name, example in get_inputs(day, inputs):
+        lines = get_input(day, example, strip)
+        for stage_name, setup, function in stages:
+            key = f"day{day}/{input_name}/{stage_name}"
+            try:
+                results[key] = time_stage(
+                    setup, function, lines, warmup, repeat, budget
+                )
+            except Exception as exception:
+                errors.append(f"{key}: {exception!r}")
+    return results, errors
+
+
+def load_baseline(path: str) -> Results:
+    try:
+        with open(path) as file:
+            return {
+                key: (summary[0], summary[1], summary[2])
+                for key, summary in json.load(file).items()
+            }
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: str, results: Results) -> None:
+    baseline = load_baseline(path)
+    baseline.update(results)
+    with open(path, "w") as file:
+        json.dump(
+            {key: list(baseline[key]) for key in sorted(baseline)}, file, indent=2
+        )
+
+
+def format_time(seconds: float) -> str:
+    return f"{seconds * 1000:.3f}ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m aoc23.bench")
+    parser.add_argument(
+        "--days",
+        type=str,
+        help="The days to benchmark, i.e. 1-12,17. Defaults to all days but 23",
+    )
+    parser.add_argument(
+        "--inputs",
+        choices=["examples", "problem", "all"],
+        default="all",
+        help="Which inputs to benchmark",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=1,
+        help="The number of untimed runs before timing",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        help="The number of timed runs. Defaults to as many as fit in --budget",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=1.0,
+        help="The seconds of timed runs per stage when --repeat is not given",
+    )
+    parser.add_argument(
+        "--strip",
+        action="store_true",
+        help="If content should be stripped",
+    )
+    parser.add_argument(
+        "--parse-cache",
+        action="store_true",
+        help="Take the input of the parts from the parsed input cache",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=f"{cache_directory()}/bench.json",
+        help="The JSON file to compare against and save to",
+    )
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="Save the results as the new baseline",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed relative slowdown of the minimum before failing",
+    )
+    parser.add_argument(
+        "--noise-floor",
+        type=float,
+        default=0.001,
+        help="Stages faster than this many seconds are never regressions",
+    )
+    args = parser.parse_args()
+
+    days = (
+        [day for day in DAYS if day not in SLOW_DAYS]
+        if args.days is None
+        else parse_days(args.days)
+    )
+    baseline = load_baseline(args.baseline)
+    results: Results = {}
+    regressions: List[str] = []
+    failed = False
+
+    print(f"{'':<24} {'min':>12} {'median':>12} {'p95':>12} {'baseline':>12}")
+    for day in days:
+        day_results, errors = bench_day(
+            day,
+            args.inputs,
+            args.warmup,
+            args.repeat,
+            args.budget,
+            args.strip,
+            args.parse_cache,
+        )
+        for error in errors:
+            print(f"Error: {error}")
+        for key, (minimum, middle, p95) in day_results.items():
+            previous = baseline.get(key)
+            compared = ""
+            if previous is not None:
+                # The minimum is the least disturbed by the rest of the machine.
+                # Below the noise floor a few microseconds are a large change
+                change = minimum / previous[0] - 1 if previous[0] > 0 else 0.0
+                compared = f"{change:+.1%}"
+                noise = max(minimum, previous[0]) < args.noise_floor
+                if change > args.threshold and not noise:
+                    regressions.append(f"{key}: {compared}")
+            print(
+                f"{key:<24} {format_time(minimum):>12} {format_time(middle):>12} "
+                f"{format_time(p95):>12} {compared:>12}"
+            )
+        results.update(day_results)
+        failed = failed or len(errors) > 0
+
+    if args.save:
+        save_baseline(args.baseline, results)
+
+    if regressions:
+        print()
+        print(f"Regressions over {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
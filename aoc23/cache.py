@@ -0,0 +1,42 @@
+import json
+import os
+from typing import Any, List, Optional
+
+from aoc23.registry import solver_version
+from aoc23.utils import atomic_write_bytes, cache_directory, evict, file_digest
+
+# Maximum size of all cached answers in bytes, the least recently used answers are
+# evicted first
+MAX_SIZE = int(os.environ.get("AOC23_CACHE_SIZE", 16 * 1024 * 1024))
+
+
+def answers_directory() -> str:
+    path = f"{cache_directory()}/answers"
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def answers_key(day: int, path: str, strip: bool) -> str:
+    # Content addressed, so a changed input or solution is a new key
+    input_hash = file_digest(path)[:32]
+    solver_hash = solver_version(day)[:32]
+    return f"day{day}-{input_hash}-{solver_hash}-{'strip' if strip else 'raw'}"
+
+
+def get_answers(key: str) -> Optional[List[Any]]:
+    path = f"{answers_directory()}/{key}.json"
+    try:
+        with open(path) as file:
+            answers: List[Any] = json.load(file)
+    except (OSError, ValueError):
+        return None
+    # Mark the answers as recently used
+    os.utime(path)
+    return answers
+
+
+def put_answers(key: str, answers: List[Any], max_size: int = MAX_SIZE) -> None:
+    directory = answers_directory()
+    path = f"{directory}/{key}.json"
+    atomic_write_bytes(path, json.dumps(answers).encode())
+    evict(directory, max_size, ".json")
@@ -0,0 +1,92 @@
+import json
+import os
+import socket
+import sys
+from typing import Any, Dict, List
+
+from aoc23.utils import cache_directory, input_path
+
+
+def default_socket_path() -> str:
+    return os.environ.get("AOC23_SOCKET") or f"{cache_directory()}/server.sock"
+
+
+def request(day: int, data: bytes, strip: bool = False, path: str = "") -> Any:
+    # A request is a JSON header line followed by the input, the response is a
+    # single JSON line
+    header = {"day": day, "size": len(data), "strip": strip}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(path or default_socket_path())
+        connection.sendall(json.dumps(header).encode() + b"\n" + data)
+        with connection.makefile("rb") as file:
+            return json.loads(file.readline())
+
+
+def format_response(response: Dict[str, Any], show_time: bool) -> str:
+    output = "".join(
+        f"Part {part}: {answer}\n"
+        for part, answer in enumerate(response["answers"], start=1)
+        if answer is not None
+    )
+    if show_time:
+        stages = ", ".join(
+            f"{stage} {wall * 1000:.3f}ms"
+            for stage, wall in response["timings"].items()
+        )
+        output += f"{stages} (request {response['wall'] * 1000:.3f}ms)\n"
+    return output
+
+
+def main(argv: List[str]) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m aoc23 client")
+    parser.add_argument(
+        "--day",
+        type=int,
+        required=True,
+        help="The day number to run",
+    )
+    parser.add_argument(
+        "--example",
+        type=int,
+        help="The example number to run",
+    )
+    parser.add_argument(
+        "--input",
+        type=str,
+        help="Solve this file instead of the problem or example input",
+    )
+    parser.add_argument(
+        "--strip",
+        action="store_true",
+        help="If content should be stripped",
+    )
+    parser.add_argument(
+        "--time",
+        action="store_true",
+        help="Print the wall time of each stage and of the request",
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default="",
+        help="The socket of the server, defaults to server.sock in the cache directory",
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.input or input_path(args.day, args.example), "rb") as file:
+        data = file.read()
+    try:
+        response = request(args.day, data, args.strip, args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(
+            "No server is listening, start one with `python -m aoc23 serve`",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    if response.get("error") is not None:
+        print(f"Error: {response['error']}", file=sys.stderr)
+        sys.exit(1)
+    print(format_response(response, args.time), end="")
@@ -1,12 +1,38 @@
-from typing import List
+from functools import cache
+from operator import itemgetter
+from typing import TYPE_CHECKING, BinaryIO, Dict, Iterable, Iterator, List, Tuple, Union
 
+if TYPE_CHECKING:
+    from mmap import mmap
+    from re import Pattern
 
-def main(input: List[str]) -> None:
-    print(part1(input))
-    print(part2(input))
 
+# The whole calibration document, as bytes or memory mapped with --mmap
+Document = Union[bytes, "mmap"]
 
-def part1(input: List[str]) -> int:
+
+def parse(lines: Iterable[str]) -> Document:
+    return "\n".join(lines).encode()
+
+
+def parse_mapped(data: Document) -> Document:
+    return data
+
+
+def main(lines: List[str]) -> None:
+    input = parse(lines)
+    print("Part 1:", part1(input))
+    print("Part 2:", part2(input))
+
+
+# The size of the chunks documents are streamed in
+CHUNK_SIZE = 1 << 20
+# Every byte except digits and newlines, to be deleted by bytes.translate
+not_digits = bytes(byte for byte in range(256) if byte not in b"0123456789\n")
+
+
+def row_calibration_sum(input: List[str]) -> int:
+    # Row by row, kept as the reference for the bulk version
     result = 0
     for row in input:
         numbers = [char for char in row if char.isdigit()]
@@ -17,6 +43,51 @@ def part1(input: List[str]) -> int:
     return result
 
 
+def calibration_sum(data: bytes) -> int:
+    # The sum of the calibration values of whole lines, without a loop in Python.
+    # Once everything except digits and newlines is deleted, the first digit of a
+    # line is at its start and the last one at its end. Each is summed as bytes,
+    # where every digit is 48 more than its value. Lines without digits are empty
+    lines = list(filter(None, data.translate(None, not_digits).split(b"\n")))
+    tens = bytes(map(itemgetter(0), lines))
+    ones = bytes(map(itemgetter(-1), lines))
+    return (sum(tens) - 48 * len(tens)) * 10 + sum(ones) - 48 * len(ones)
+
+
+def read_chunks(file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    # A file of any size in chunks of whole lines, in constant memory. A chunk is
+    # cut at its last newline, and the partial line after it is carried over to the
+    # next chunk
+    rest = b""
+    while chunk := file.read(chunk_size):
+        chunk = rest + chunk
+        end = chunk.rfind(b"\n") + 1
+        rest = chunk[end:]
+        yield chunk[:end]
+    yield rest
+
+
+def document_chunks(
+    document: Document, chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    # A document, such as a memory mapped file, in chunks of whole lines. Each chunk
+    # ends after the first newline at least chunk_size bytes from its start
+    start = 0
+    while start < len(document):
+        end = document.find(b"\n", start + chunk_size) + 1 or len(document)
+        yield document[start:end]
+        start = end
+
+
+def stream_calibration_sum(file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> int:
+    return sum(map(calibration_sum, read_chunks(file, chunk_size)))
+
+
+def part1(document: Document) -> int:
+    # A chunk at a time, so a memory mapped document is never read into memory whole
+    return sum(map(calibration_sum, document_chunks(document)))
+
+
 string_digits = {
     "one": "1",
     "two": "2",
@@ -28,41 +99,37 @@ string_digits = {
     "eight": "8",
     "nine": "9",
 }
+# Digit or spelled digit -> its value
+digit_values: Dict[bytes, int] = {
+    **{str(value).encode(): value for value in range(10)},
+    **{key.encode(): int(value) for key, value in string_digits.items()},
+}
 
 
-def part2(input: List[str]) -> int:
-    result = 0
+@cache
+def get_patterns() -> Tuple["Pattern[bytes]", "Pattern[bytes]"]:
+    import re
 
-    for row in input:
-        number = ""
-        left = 0
-        right = len(row) - 1
-        while left < len(row):
-            found = False
-            for key in string_digits:
-                if row[left:].startswith(key):
-                    number += string_digits[key]
-                    found = True
-                    break
-            if found:
-                break
-            if row[left].isdigit():
-                number += row[left]
-                break
-            left += 1
-
-        while right >= 0:
-            found = False
-            for key in string_digits:
-                if row[right:].startswith(key):
-                    number += string_digits[key]
-                    found = True
-                    break
-            if found:
-                break
-            if row[right].isdigit():
-                number += row[right]
-                break
-            right -= 1
-        result += int(number)
-    return result
+    digit = b"(" + b"|".join([rb"\d", *(key.encode() for key in string_digits)]) + b")"
+    # Every line is matched once from its start. The lazy .*? stops at the first
+    # digit, and the greedy .* at the start of the last one, so overlapping words
+    # like "oneight" are found from both ends without slicing the line
+    first = re.compile(rb"^.*?" + digit, re.MULTILINE)
+    last = re.compile(rb"^.*" + digit, re.MULTILINE)
+    return first, last
+
+
+def spelled_calibration_sum(data: Document, chunk_size: int = CHUNK_SIZE) -> int:
+    # The sum of the calibration values of a whole document, such as a memory mapped
+    # file. Lines without digits have no value. The document is matched in chunks
+    # of whole lines, so the matches in memory do not grow with the document
+    first, last = get_patterns()
+    return sum(
+        digit_values[tens] * 10 + digit_values[ones]
+        for chunk in document_chunks(data, chunk_size)
+        for tens, ones in zip(first.findall(chunk), last.findall(chunk))
+    )
+
+
+def part2(document: Document) -> int:
+    return spelled_calibration_sum(document)
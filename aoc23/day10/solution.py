@@ -1,8 +1,7 @@
-import re
-from typing import Dict, List, Tuple
-
-Coord = Tuple[int, int]
+from typing import Dict, Iterable, List, Tuple
 
+from aoc23.search import UNREACHED, bfs, count_stats
+from aoc23.utils import Grid, run_cached
 
 # | is a vertical pipe connecting north and south.
 # - is a horizontal pipe connecting east and west.
@@ -11,96 +10,75 @@ Coord = Tuple[int, int]
 # 7 is a 90-degree bend connecting south and west.
 # F is a 90-degree bend connecting south and east.
 
-
-def get_next_positions(position: Coord, lines: List[str]) -> List[Coord]:
-    x, y = position
-    character = lines[y][x]
-
-    if character == "|":
-        return [(x, y - 1), (x, y + 1)]
-    elif character == "-":
-        return [(x - 1, y), (x + 1, y)]
-    elif character == "L":
-        return [(x + 1, y), (x, y - 1)]
-    elif character == "J":
-        return [(x - 1, y), (x, y - 1)]
-    elif character == "7":
-        return [(x - 1, y), (x, y + 1)]
-    elif character == "F":
-        return [(x + 1, y), (x, y + 1)]
-    elif character == "S":
-        return predict_next_positions(position, lines)
-
+# Pipe -> directions it connects, as indices into Grid.offsets (up, right, down, left)
+connections: Dict[int, Tuple[int, int]] = {
+    ord("|"): (0, 2),
+    ord("-"): (3, 1),
+    ord("L"): (1, 0),
+    ord("J"): (3, 0),
+    ord("7"): (3, 2),
+    ord("F"): (1, 2),
+}
+# Direction -> pipes connecting back from the neighbour in that direction
+connecting = ["|7F", "-J7", "|LJ", "-LF"]
+
+
+def get_next_positions(position: int, grid: Grid) -> List[int]:
+    character = grid.cells[position]
+    if character == ord("S"):
+        return predict_next_positions(position, grid)
+    if character in connections:
+        return [
+            position + grid.offsets[direction] for direction in connections[character]
+        ]
     return []
 
 
-def predict_next_positions(position: Coord, lines: List[str]) -> List[Coord]:
-    x, y = position
-    next_positions: List[Coord] = []
-
-    # Up
-    if y > 0 and lines[y - 1][x] in "|7F":
-        next_positions.append((x, y - 1))
-    # Down
-    if y < len(lines) - 1 and lines[y + 1][x] in "|LJ":
-        next_positions.append((x, y + 1))
-    # Left
-    if x > 0 and lines[y][x - 1] in "-LF":
-        next_positions.append((x - 1, y))
-    # Right
-    if x < len(lines[y]) - 1 and lines[y][x + 1] in "-J7":
-        next_positions.append((x + 1, y))
+def predict_next_positions(position: int, grid: Grid) -> List[int]:
+    # The border is ".", so it never connects
+    next_positions: List[int] = []
+    for direction in (0, 2, 3, 1):
+        neighbour = position + grid.offsets[direction]
+        if chr(grid.cells[neighbour]) in connecting[direction]:
+            next_positions.append(neighbour)
     return next_positions
 
 
-def get_starting_position(lines: List[str]) -> Coord:
-    for y, line in enumerate(lines):
-        try:
-            return (line.index("S"), y)
-        except Exception:
-            pass
-    raise Exception("No starting position found")
-
-
-def get_distances(lines: List[str]) -> Dict[Coord, int]:
-    # Coordinate -> (number of steps to get there)
-    distances: Dict[Coord, int] = {}
-
-    starting_position = get_starting_position(lines)
-    next_positions: List[Tuple[Coord, int]] = [(starting_position, 0)]
-
-    while next_positions:
-        position, steps = next_positions.pop(0)
-
-        if position in distances:
-            continue
+@run_cached
+def get_distances(grid: Grid) -> List[int]:
+    # Index -> (number of steps to get there), UNREACHED outside of the loop
+    distances, stats = bfs(
+        [grid.find("S")],
+        lambda position: get_next_positions(position, grid),
+        len(grid.cells),
+    )
+    count_stats("day10 bfs", stats)
+    return distances
 
-        distances[position] = steps
 
-        next_positions.extend(
-            (next_position, steps + 1)
-            for next_position in get_next_positions(position, lines)
-        )
+def parse(lines: Iterable[str]) -> Grid:
+    return Grid(lines, border=".")
 
-    return distances
 
+def part1(grid: Grid) -> int:
+    distances = get_distances(grid)
+    return max(distances)
 
-def part1(lines: List[str]) -> None:
-    distances = get_distances(lines)
-    print("Part 1:", max(distances.values()))
 
+def part2(grid: Grid) -> int:
+    import re
 
-def part2(lines: List[str]) -> None:
-    distances = get_distances(lines)
-    # Replace all of the characters not in the main loop with .
-    for y, line in enumerate(lines):
-        for x, _ in enumerate(line):
-            if (x, y) not in distances:
-                lines[y] = lines[y][:x] + "." + lines[y][x + 1 :]
+    distances = get_distances(grid)
 
     # We can find the number of enclosed spaces by counting the number of vertical pipes
     enclosed_count = 0
-    for line in lines:
+    for y in range(grid.height):
+        start = grid.index(0, y)
+        # Replace all of the characters not in the main loop with .
+        line = "".join(
+            chr(grid.cells[index]) if distances[index] != UNREACHED else "."
+            for index in range(start, start + grid.width)
+        )
         # This might need to be changed depending on the input
         line = re.sub(r"S", "|", line)
         # Collapse all of the 90 degree bends into a single, vertical, character
@@ -113,9 +91,10 @@ def part2(lines: List[str]) -> None:
             if char == "." and vertical_count % 2 == 1:
                 enclosed_count += 1
 
-    print("Part 2:", enclosed_count)
+    return enclosed_count
 
 
 def main(lines: List[str]) -> None:
-    part1(lines)
-    part2(lines)
+    input = parse(lines)
+    print("Part 1:", part1(input))
+    print("Part 2:", part2(input))
@@ -1,10 +1,15 @@
+import operator
 from functools import cache, reduce
-from typing import List, Tuple
+from typing import Iterable, List, Tuple
 
-Input = List[Tuple[Tuple[str, ...], Tuple[int, ...]]]
+from aoc23.utils import SharedPool, count, part_workers
 
+# (conditions, sizes of the groups of broken springs)
+Row = Tuple[Tuple[str, ...], Tuple[int, ...]]
+Input = List[Row]
 
-def parse_input(lines: List[str]) -> Input:
+
+def parse(lines: Iterable[str]) -> Input:
     input = []
     for line in lines:
         conditions_str, sizes_str = line.strip().split(" ")
@@ -53,23 +58,45 @@ def is_valid(rest: Tuple[str], sizes: Tuple[int]) -> int:
     raise Exception("Invalid input")
 
 
-def part1(input: Input) -> None:
-    result = 0
-    for conditions, sizes in input:
-        result += is_valid(conditions, sizes)
-    print("Part 1:", result)
+def count_cache(hits: int, misses: int) -> None:
+    # Report the hits and misses of is_valid since the given counts
+    info = is_valid.cache_info()
+    count("day12 is_valid hits", info.hits - hits)
+    count("day12 is_valid misses", info.misses - misses)
+
+
+def count_arrangements(rows: List[Row]) -> int:
+    # Also runs in the workers of a SharedPool, each with its own cache of is_valid
+    return sum(is_valid(conditions, sizes) for conditions, sizes in rows)
+
+
+def sum_arrangements(rows: Input) -> int:
+    workers = part_workers()
+    if workers > 1:
+        # Every row is independent and small, so the rows are the tasks and there
+        # is nothing to share
+        with SharedPool({}, workers=workers) as pool:
+            return pool.map_reduce(count_arrangements, rows, operator.add, 0)
+
+    before = is_valid.cache_info()
+    result = count_arrangements(rows)
+    count_cache(before.hits, before.misses)
+    return result
+
+
+def part1(input: Input) -> int:
+    return sum_arrangements(input)
 
 
-def part2(input: Input) -> None:
-    result = 0
-    for conditions, sizes in input:
-        new_sizes = sizes * 5
-        new_conditions = reduce(lambda a, b: a + ("?",) + b, (conditions,) * 5)
-        result += is_valid(new_conditions, new_sizes)
-    print("Part 2:", result)
+def part2(input: Input) -> int:
+    rows = [
+        (reduce(lambda a, b: a + ("?",) + b, (conditions,) * 5), sizes * 5)
+        for conditions, sizes in input
+    ]
+    return sum_arrangements(rows)
 
 
 def main(lines: List[str]) -> None:
-    input = parse_input(lines)
-    part1(input)
-    part2(input)
+    input = parse(lines)
+    print("Part 1:", part1(input))
+    print("Part 2:", part2(input))
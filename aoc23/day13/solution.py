@@ -1,44 +1,45 @@
-from typing import List, cast
+from typing import Iterable, List
 
-Grid = List[List[str]]
+from aoc23.utils import Grid
+
+Rows = List[bytes]
 Input = List[Grid]
 
 
-def parse_input(lines: List[str]) -> Input:
+def parse(lines: Iterable[str]) -> Input:
     input: Input = []
-    current: Grid = []
+    current: List[str] = []
     for line in lines:
         if line.strip() == "":
-            input.append(current)
+            input.append(Grid(current))
             current = []
             continue
-        current.append(list(line.strip()))
-    input.append(current)
+        current.append(line)
+    input.append(Grid(current))
     return input
 
 
 def print_grid(grid: Grid) -> None:
     print()
-    for row in grid:
-        print("".join(row))
+    print(grid)
 
 
-def part1(input: Input) -> None:
-    def test_grid(grid: Grid, i: int) -> int:
+def part1(input: Input) -> int:
+    def test_grid(grid: Rows, i: int) -> int:
         left_index = i - 1
         right_index = i
         while left_index >= 0 and right_index < len(grid):
             left = grid[left_index]
             right = grid[right_index]
-            if "".join(left) != "".join(right):
+            if left != right:
                 return False
             left_index -= 1
             right_index += 1
 
         return True
 
-    def pattern_notes(grid: Grid) -> int:
-        transposed_grid = cast(Grid, list(zip(*grid)))
+    def pattern_notes(pattern: Grid) -> int:
+        grid = pattern.rows()
         # First try and find a reflection along the y-axis
         for y in range(1, len(grid)):
             is_valid = test_grid(grid, y)
@@ -46,6 +47,7 @@ def part1(input: Input) -> None:
                 return y * 100
         # Then try and find a reflection along the y-axis
 
+        transposed_grid = pattern.transposed.rows()
         for x in range(1, len(transposed_grid)):
             is_valid = test_grid(transposed_grid, x)
             if is_valid:
@@ -55,11 +57,11 @@ def part1(input: Input) -> None:
     result = 0
     for grid in input:
         result += pattern_notes(grid)
-    print(f"Part 1: {result}")
+    return result
 
 
-def part2(input: Input) -> None:
-    def check_for_smudge(left_row: List[str], right_row: List[str]) -> bool:
+def part2(input: Input) -> int:
+    def check_for_smudge(left_row: bytes, right_row: bytes) -> bool:
         differences = 0
         for left, right in zip(left_row, right_row):
             if left != right:
@@ -68,14 +70,14 @@ def part2(input: Input) -> None:
                 return False
         return differences == 1
 
-    def test_grid(grid: Grid, i: int) -> int:
+    def test_grid(grid: Rows, i: int) -> int:
         has_fixed_smudge = False
         left_index = i - 1
         right_index = i
         while left_index >= 0 and right_index < len(grid):
             left = grid[left_index]
             right = grid[right_index]
-            if "".join(left) != "".join(right):
+            if left != right:
                 if not has_fixed_smudge and check_for_smudge(left, right):
                     has_fixed_smudge = True
                 else:
@@ -85,8 +87,8 @@ def part2(input: Input) -> None:
 
         return has_fixed_smudge
 
-    def pattern_notes(grid: Grid) -> int:
-        transposed_grid = cast(Grid, list(zip(*grid)))
+    def pattern_notes(pattern: Grid) -> int:
+        grid = pattern.rows()
         # First try and find a reflection along the y-axis
         for y in range(1, len(grid)):
             is_valid = test_grid(grid, y)
@@ -94,6 +96,7 @@ def part2(input: Input) -> None:
                 return y * 100
 
         # Then try and find a reflection along the y-axis
+        transposed_grid = pattern.transposed.rows()
         for x in range(1, len(transposed_grid)):
             is_valid = test_grid(transposed_grid, x)
             if is_valid:
@@ -103,10 +106,10 @@ def part2(input: Input) -> None:
     result = 0
     for grid in input:
         result += pattern_notes(grid)
-    print(f"Part 2: {result}")
+    return result
 
 
 def main(lines: List[str]) -> None:
-    input = parse_input(lines)
-    part1(input)
-    part2(input)
+    input = parse(lines)
+    print(f"Part 1: {part1(input)}")
+    print(f"Part 2: {part2(input)}")
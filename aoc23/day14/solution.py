@@ -1,91 +1,81 @@
-from copy import deepcopy
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple
 
-Input = List[List[str]]
-Coord = Tuple[int, int]
+from aoc23.utils import Grid, Span
 
+rock = ord("O")
+empty = ord(".")
 
-def parse_input(lines: List[str]) -> List[List[str]]:
-    return [list(line.strip()) for line in lines]
 
+def parse(lines: Iterable[str]) -> Grid:
+    # The border is a wall of cube rocks, so rolling rocks stop at the edges
+    return Grid(lines, border="#")
 
-def print_input(input: Input) -> None:
+
+def print_input(grid: Grid) -> None:
     print()
-    for line in input:
-        print("".join(line))
-
-
-def move(coord: Coord, input: Input, delta_x: int, delta_y: int) -> Input:
-    x, y = coord
-    input[y][x] = "."
-    next_x = x
-    next_y = y
-    while (
-        (next_x + delta_x) < len(input)
-        and (next_x + delta_x) >= 0
-        and (next_y + delta_y) < len(input)
-        and (next_y + delta_y) >= 0
-        and input[next_y + delta_y][next_x + delta_x] == "."
-    ):
-        next_x += delta_x
-        next_y += delta_y
-    input[next_y][next_x] = "O"
-    return input
-
-
-def tilt_lever(input: Input, direction: int) -> Input:
-    delta_x = [0, -1, 0, 1][direction]
-    delta_y = [-1, 0, 1, 0][direction]
-    # If moving from bottom, start from bottom
-    y_range = range(len(input) - 1, -1, -1) if direction == 2 else range(len(input))
-    # If moving from right, start from right
-    x_range = (
-        range(len(input[0]) - 1, -1, -1) if direction == 3 else range(len(input[0]))
-    )
-
-    for y in y_range:
-        line = input[y]
-        for x in x_range:
-            c = line[x]
-            if c == "O":
-                input = move((x, y), input, delta_x, delta_y)
-
-    return input
-
-
-def get_load(input: Input) -> int:
+    print(grid)
+
+
+@Span("tilt_lever")
+def tilt_lever(grid: Grid, direction: int, order: List[int]) -> Grid:
+    # Directions are north, west, south and east. The rocks closest to the edge they
+    # roll towards have to move first, which the order of the indices makes sure of
+    offset = grid.offsets[(0, 3, 2, 1)[direction]]
+    cells = grid.cells
+    for index in order:
+        if cells[index] != rock:
+            continue
+        next_index = index
+        while cells[next_index + offset] == empty:
+            next_index += offset
+        cells[index] = empty
+        cells[next_index] = rock
+
+    return grid
+
+
+def get_orders(grid: Grid) -> List[List[int]]:
+    # Row by row for north and west, backwards for south and east
+    order = list(grid.indices())
+    backwards = order[::-1]
+    return [order, order, backwards, backwards]
+
+
+def get_load(grid: Grid) -> int:
     load = 0
-    for y, line in enumerate(input):
-        for c in line:
-            if c == "O":
-                load += len(input) - y
+    for y, row in enumerate(grid.rows()):
+        load += row.count(rock) * (grid.height - y)
     return load
 
 
-def part1(input: Input) -> None:
-    input = tilt_lever(deepcopy(input), 0)
-    load = get_load(input)
-    print(f"Part 1: {load}")
+def part1(grid: Grid) -> int:
+    grid = grid.copy()
+    return get_load(tilt_lever(grid, 0, get_orders(grid)[0]))
 
 
-def part2(input: Input) -> None:
+def part2(grid: Grid) -> int:
+    # Tilting happens in place, so work on a copy of the parsed input
+    grid = grid.copy()
+    orders = get_orders(grid)
     cycles = 4_000_000_000
-    cache: Dict[Tuple[str, int], Input] = {}
-    cache_order: List[Tuple[str, int]] = []
+    # The cells themselves are the key, one byte per cell
+    cache: Dict[Tuple[bytes, int], int] = {}
+    cache_order: List[Tuple[bytes, int]] = []
 
     cycle_start = 0
     cycle_end = 0
-    for i in range(cycles):
-        direction = i % 4
-        cache_key = ("".join(["".join(line) for line in input]), direction)
-        if cache_key in cache:
-            # Cycle detected, we can calculate the final load
-            cycle_start = cache_order.index(cache_key)
-            cycle_end = i
-            break
-        cache_order.append(cache_key)
-        cache[cache_key] = deepcopy(input)
-        input = tilt_lever(input, direction)
+    with Span("cycle search"):
+        for i in range(cycles):
+            direction = i % 4
+            cache_key = (bytes(grid.cells), direction)
+            if cache_key in cache:
+                # Cycle detected, we can calculate the final load
+                cycle_start = cache[cache_key]
+                cycle_end = i
+                break
+            cache[cache_key] = i
+            cache_order.append(cache_key)
+            grid = tilt_lever(grid, direction, orders[direction])
 
     # Get the length of the repeating cycle
     cycle_length = cycle_end - cycle_start
@@ -94,13 +84,14 @@ def part2(input: Input) -> None:
     # Get the index of the repeating cycle
     cycle_index = cycle_offset % cycle_length
     # Get the cache key of the 4 billionth iteration
-    cache_key = cache_order[cycle_start + cycle_index]
+    cells, _ = cache_order[cycle_start + cycle_index]
 
-    load = get_load(cache[cache_key])
-    print(f"Part 2: {load}")
+    with Span("replay"):
+        grid.cells[:] = cells
+        return get_load(grid)
 
 
 def main(lines: List[str]) -> None:
-    input = parse_input(lines)
-    part1(input)
-    part2(input)
+    input = parse(lines)
+    print(f"Part 1: {part1(input)}")
+    print(f"Part 2: {part2(input)}")
@@ -1,11 +1,11 @@
-import re
-from typing import Dict, List, Literal, Tuple, cast
+from typing import Dict, Iterable, List, Literal, Tuple, cast
 
 Input = List[str]
 
 
-def parse_input(lines: List[str]) -> Input:
-    input = [sequence for sequence in lines[0].strip().split(",")]
+def parse(lines: Iterable[str]) -> Input:
+    first_line = next(iter(lines))
+    input = [sequence for sequence in first_line.strip().split(",")]
     return input
 
 
@@ -19,12 +19,13 @@ def hash(sequence: str) -> int:
     return current_value
 
 
-def part1(input: Input) -> None:
-    result = sum(hash(sequence) for sequence in input)
-    print(f"Part 1: {result}")
+def part1(input: Input) -> int:
+    return sum(hash(sequence) for sequence in input)
 
 
-def part2(input: Input) -> None:
+def part2(input: Input) -> int:
+    import re
+
     Operation = Tuple[str, Literal["+", "-", "="], int]
 
     operations: List[Operation] = [
@@ -70,11 +71,10 @@ def part2(input: Input) -> None:
             for slot, (_, length) in enumerate(lenses)
         )
 
-    result = focus_power(hash_map)
-    print(f"Part 2: {result}")
+    return focus_power(hash_map)
 
 
 def main(lines: List[str]) -> None:
-    input = parse_input(lines)
-    part1(input)
-    part2(input)
+    input = parse(lines)
+    print(f"Part 1: {part1(input)}")
+    print(f"Part 2: {part2(input)}")
@@ -1,134 +1,113 @@
-from typing import Dict, List, Literal, Set, Tuple, cast
+from typing import Dict, Iterable, List, Sequence, Tuple
 
-Coord = Tuple[int, int]
-Grid = List[List[str]]
-Direction = Literal["up", "down", "left", "right"]
-State = Tuple[Coord, Direction]
+from aoc23 import utils
+from aoc23.utils import Grid, SharedPool, count, counting, part_workers
 
+# Directions are indices into Grid.offsets: up, right, down and left
+Direction = int
+# (index, direction the beam moves in)
+State = Tuple[int, Direction]
 
-def parse_input(input: List[str]) -> Grid:
-    return [list(line.strip()) for line in input]
+UP, RIGHT, DOWN, LEFT = range(4)
 
+# Tile -> directions the beam leaves in, for each direction it enters in
+next_directions: Dict[int, Tuple[Tuple[Direction, ...], ...]] = {
+    ord("."): ((UP,), (RIGHT,), (DOWN,), (LEFT,)),
+    ord("|"): ((UP,), (UP, DOWN), (DOWN,), (UP, DOWN)),
+    ord("-"): ((LEFT, RIGHT), (RIGHT,), (LEFT, RIGHT), (LEFT,)),
+    ord("/"): ((RIGHT,), (UP,), (LEFT,), (DOWN,)),
+    ord("\\"): ((LEFT,), (DOWN,), (RIGHT,), (UP,)),
+}
 
-def get_next_coord(current: Coord, grid: Grid, direction: Direction) -> Coord | None:
-    (x, y) = current
-    if direction == "up" and y > 0:
-        return (x, y - 1)
-    elif direction == "down" and y < len(grid) - 1:
-        return (x, y + 1)
-    elif direction == "left" and x > 0:
-        return (x - 1, y)
-    elif direction == "right" and x < len(grid[0]) - 1:
-        return (x + 1, y)
-    return None
+
+def parse(input: Iterable[str]) -> Grid:
+    return Grid(input)
 
 
 def print_grid(grid: Grid) -> None:
-    for row in grid:
-        print("".join(row))
-
-
-def get_next_states(grid: Grid, coord: Coord, direction: Direction) -> List[State]:
-    (x, y) = coord
-    current = grid[y][x]
-    next_states: List[Tuple[Coord | None, Direction]] = []
-    if (
-        current == "."
-        or (current == "|" and (direction == "up" or direction == "down"))
-        or (current == "-" and (direction == "left" or direction == "right"))
-    ):
-        # Continue the beam
-        next_states.append((get_next_coord(coord, grid, direction), direction))
-    elif current == "|" and (direction == "left" or direction == "right"):
-        # Split the beam up and down
-        next_states.append((get_next_coord(coord, grid, "up"), "up"))
-        next_states.append((get_next_coord(coord, grid, "down"), "down"))
-    elif current == "-" and (direction == "up" or direction == "down"):
-        # Split the beam left and right
-        next_states.append((get_next_coord(coord, grid, "left"), "left"))
-        next_states.append((get_next_coord(coord, grid, "right"), "right"))
-    elif (current == "/" and direction == "up") or (
-        current == "\\" and direction == "down"
-    ):
-        # Split the beam right
-        next_states.append((get_next_coord(coord, grid, "right"), "right"))
-    elif (current == "/" and direction == "down") or (
-        current == "\\" and direction == "up"
-    ):
-        # Split the beam left
-        next_states.append((get_next_coord(coord, grid, "left"), "left"))
-    elif (current == "/" and direction == "left") or (
-        current == "\\" and direction == "right"
-    ):
-        # Split the beam down
-        next_states.append((get_next_coord(coord, grid, "down"), "down"))
-    elif (current == "/" and direction == "right") or (
-        current == "\\" and direction == "left"
-    ):
-        # Split the beam up
-        next_states.append((get_next_coord(coord, grid, "up"), "up"))
-    else:
-        raise Exception(f"Unknown state: {current} at {coord}")
-
-    # Get next states without next coordinate
-    return [
-        cast(State, (next_coord, next_direction))
-        for (next_coord, next_direction) in next_states
-        if next_coord is not None
-    ]
+    print(grid)
 
 
 def get_energized_tiles(grid: Grid, starting_state: State) -> int:
-    visited: Dict[Coord, Set[Direction]] = {}
+    return energize(grid.cells, grid.offsets, grid.border, starting_state)
+
+
+def energize(
+    cells: Sequence[int], offsets: Tuple[int, ...], border: int, starting_state: State
+) -> int:
+    # Index -> bit mask of the directions a beam has passed through it in
+    visited = bytearray(len(cells))
     next_states: List[State] = [starting_state]
 
     while len(next_states) > 0:
-        next_state = next_states.pop()
-        next_coord, next_direction = next_state
-        visited.setdefault(next_coord, set())
-        if next_direction in visited[next_coord]:
+        index, direction = next_states.pop()
+        mask = 1 << direction
+        if visited[index] & mask:
             continue
-        visited[next_coord].add(next_direction)
-        next_states += get_next_states(grid, next_coord, next_direction)
+        visited[index] |= mask
+        for next_direction in next_directions[cells[index]][direction]:
+            next_index = index + offsets[next_direction]
+            # The beam leaves the grid at the border
+            if cells[next_index] != border:
+                next_states.append((next_index, next_direction))
 
-    return len(visited)
+    count("day16 beams")
+    if counting():
+        # Every set bit is a (tile, direction) state a beam passed through
+        count("day16 beam states", sum(map(int.bit_count, visited)))
+    return len(visited) - visited.count(0)
 
 
-def part1(grid: Grid) -> None:
-    result = get_energized_tiles(grid, ((0, 0), "right"))
-    print("Part 1:", result)
+def most_energized(starting_states: List[State]) -> int:
+    # Runs in the workers of a SharedPool, on the cells in shared memory
+    offsets, border = utils.shared_context
+    cells = utils.shared_buffers["cells"]
+    return max(energize(cells, offsets, border, state) for state in starting_states)
 
 
-def part2(grid: Grid) -> None:
-    starting_points: List[Tuple[Coord, Direction]] = []
+def part1(grid: Grid) -> int:
+    return get_energized_tiles(grid, (grid.index(0, 0), RIGHT))
+
+
+def part2(grid: Grid) -> int:
+    right = grid.width - 1
+    bottom = grid.height - 1
+    starting_points: List[State] = []
     # Special cases: Edge, can go either direction from the edge
     # Top left corner
-    starting_points.append(((0, 0), "right"))
-    starting_points.append(((0, 0), "down"))
+    starting_points.append((grid.index(0, 0), RIGHT))
+    starting_points.append((grid.index(0, 0), DOWN))
     # Top right corner
-    starting_points.append(((len(grid[0]) - 1, 0), "left"))
-    starting_points.append(((len(grid[0]) - 1, 0), "down"))
+    starting_points.append((grid.index(right, 0), LEFT))
+    starting_points.append((grid.index(right, 0), DOWN))
     # Bottom left corner
-    starting_points.append(((0, len(grid) - 1), "up"))
-    starting_points.append(((0, len(grid) - 1), "right"))
+    starting_points.append((grid.index(0, bottom), UP))
+    starting_points.append((grid.index(0, bottom), RIGHT))
     # Bottom right corner
-    starting_points.append(((len(grid[0]) - 1, len(grid) - 1), "up"))
-    starting_points.append(((len(grid[0]) - 1, len(grid) - 1), "left"))
+    starting_points.append((grid.index(right, bottom), UP))
+    starting_points.append((grid.index(right, bottom), LEFT))
     # Add all along the top and bottom, exclude the corners
-    for x in range(1, len(grid[0]) - 1):
-        starting_points.append(((x, 0), "down"))
-        starting_points.append(((x, len(grid) - 1), "up"))
+    for x in range(1, right):
+        starting_points.append((grid.index(x, 0), DOWN))
+        starting_points.append((grid.index(x, bottom), UP))
     # Add all along the left and right, exclude the corners
-    for y in range(1, len(grid) - 1):
-        starting_points.append(((0, y), "right"))
-        starting_points.append(((len(grid[0]) - 1, y), "left"))
+    for y in range(1, bottom):
+        starting_points.append((grid.index(0, y), RIGHT))
+        starting_points.append((grid.index(right, y), LEFT))
+    workers = part_workers()
+    if workers > 1:
+        # Every start is independent, only the grid is shared
+        context = (grid.offsets, grid.border)
+        with SharedPool({"cells": grid.cells}, context, workers) as pool:
+            return pool.map_reduce(most_energized, starting_points, max, 0)
+
     maximum = 0
     for state in starting_points:
         maximum = max(maximum, get_energized_tiles(grid, state))
-    print("Part 2:", maximum)
+    return maximum
 
 
 def main(lines: List[str]) -> None:
-    grid = parse_input(lines)
-    part1(grid)
-    part2(grid)
+    grid = parse(lines)
+    print("Part 1:", part1(grid))
+    print("Part 2:", part2(grid))
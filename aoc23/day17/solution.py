@@ -1,85 +1,109 @@
-from queue import PriorityQueue
-from typing import List, Literal, Set, Tuple
+from typing import Iterable, Iterator, List, Tuple
 
-City = List[List[int]]
-Direction = Literal["up", "down", "left", "right"]
-Coord = Tuple[int, int]
-# Tuple of (coord, direction, number of steps in same direction, max 3)
-Node = Tuple[Coord, Direction | None, int]
+from aoc23.search import Stats, astar, count_stats, dial, dijkstra
+from aoc23.utils import Grid
 
+# Directions are indices into Grid.offsets: up, right, down and left. The start has
+# not moved in any direction yet
+START = 4
+# Tuple of (index, direction, number of steps in same direction, max 3)
+Node = Tuple[int, int, int]
 
-def parse_input(lines: List[str]) -> City:
-    return [[int(x) for x in line.strip()] for line in lines]
 
+def parse(lines: Iterable[str]) -> Grid:
+    return Grid(lines, border="\0")
 
-def get_neighbors(city: City, node: Node, min: int, max: int) -> List[Node]:
-    (x, y), direction, steps = node
+
+def get_neighbors(city: Grid, node: Node, min: int, max: int) -> List[Node]:
+    index, direction, steps = node
+    cells = city.cells
     neighbors: List[Node] = []
     # We can only turn and move in the same direction the maximum times
-    if steps < max:
+    if steps < max and direction != START:
         # Try to move in the same direction
-        if direction == "up" and y - 1 >= 0:
-            neighbors.append(((x, y - 1), direction, steps + 1))
-        elif direction == "down" and y + 1 < len(city):
-            neighbors.append(((x, y + 1), direction, steps + 1))
-        elif direction == "left" and x - 1 >= 0:
-            neighbors.append(((x - 1, y), direction, steps + 1))
-        elif direction == "right" and x + 1 < len(city[0]):
-            neighbors.append(((x + 1, y), direction, steps + 1))
+        next_index = index + city.offsets[direction]
+        if cells[next_index] != city.border:
+            neighbors.append((next_index, direction, steps + 1))
 
     # We can turn if we haven't stepped forward the minimum amount times
     # Edge case: if we are at the start, we can turn
-    if steps < min and direction is not None:
+    if steps < min and direction != START:
         return neighbors
 
-    if (direction != "up" and direction != "down") and y - 1 >= 0:
-        # Left and right can go up
-        neighbors.append(((x, y - 1), "up", 1))
-    if (direction != "up" and direction != "down") and y + 1 < len(city):
-        # Left and right can go down
-        neighbors.append(((x, y + 1), "down", 1))
-    if (direction != "left" and direction != "right") and x - 1 >= 0:
-        # Up and down can go left
-        neighbors.append(((x - 1, y), "left", 1))
-    if (direction != "left" and direction != "right") and x + 1 < len(city[0]):
-        # Up and down can go right
-        neighbors.append(((x + 1, y), "right", 1))
-
-    return neighbors
-
-
-def dijkstra(city: City, start: Coord, end: Coord, min: int = 0, max: int = 3) -> int:
-    queue: PriorityQueue[Tuple[int, Node]] = PriorityQueue()
-    visited: Set[Node] = set()
-    queue.put((0, (start, None, 0)))
-    while not queue.empty():
-        acc, node = queue.get()
-        if node in visited:
+    for turn, offset in enumerate(city.offsets):
+        # Up and down can go left and right, and the other way around
+        if direction != START and turn % 2 == direction % 2:
             continue
-        if node[0] == end and node[2] >= min:
-            return acc
-        visited.add(node)
-        for neighbor in get_neighbors(city, node, min, max):
-            queue.put((acc + city[neighbor[0][1]][neighbor[0][0]], neighbor))
-
-    raise Exception("No path found")
+        next_index = index + offset
+        if cells[next_index] != city.border:
+            neighbors.append((next_index, turn, 1))
 
-
-def part1(city: City) -> None:
-    start = 0, 0
-    end = len(city[0]) - 1, len(city) - 1
-    result = dijkstra(city, start, end)
-    print("Part 1:", result)
+    return neighbors
 
 
-def part2(city: City) -> None:
-    start = 0, 0
-    end = len(city[0]) - 1, len(city) - 1
-    result = dijkstra(city, start, end, min=4, max=10)
-    print("Part 2:", result)
+def least_heat_loss(
+    city: Grid,
+    start: int,
+    end: int,
+    min: int = 0,
+    max: int = 3,
+    strategy: str = "dial",
+) -> Tuple[int, Stats]:
+    # Nodes are encoded as ((index * 5) + direction) * (max + 1) + steps
+    steps_count = max + 1
+
+    def encode(node: Node) -> int:
+        index, direction, steps = node
+        return (index * 5 + direction) * steps_count + steps
+
+    def neighbours(state: int) -> Iterator[Tuple[int, int]]:
+        rest, steps = divmod(state, steps_count)
+        index, direction = divmod(rest, 5)
+        for neighbor in get_neighbors(city, (index, direction, steps), min, max):
+            # Heat loss is the digit in the cell
+            yield encode(neighbor), city.cells[neighbor[0]] - 48
+
+    def is_end(state: int) -> bool:
+        rest, steps = divmod(state, steps_count)
+        return rest // 5 == end and steps >= min
+
+    end_x, end_y = city.coord(end)
+
+    def distance_to_end(state: int) -> int:
+        # Every block loses at least 1 heat, so this never overestimates
+        x, y = city.coord(state // steps_count // 5)
+        return abs(end_x - x) + abs(end_y - y)
+
+    starts = [encode((start, START, 0))]
+    size = len(city.cells) * 5 * steps_count
+    if strategy == "astar":
+        heat_loss, stats = astar(starts, neighbours, size, is_end, distance_to_end)
+    elif strategy == "dijkstra":
+        heat_loss, stats = dijkstra(starts, neighbours, size, is_end)
+    else:
+        # Heat loss is at most 9 per block, so a ring of 10 buckets replaces the heap
+        heat_loss, stats = dial(starts, neighbours, size, is_end, 9)
+    if heat_loss is None:
+        raise Exception("No path found")
+    count_stats(f"day17 {strategy}", stats)
+    return heat_loss, stats
+
+
+def part1(city: Grid) -> int:
+    start = city.index(0, 0)
+    end = city.index(city.width - 1, city.height - 1)
+    heat_loss, _ = least_heat_loss(city, start, end)
+    return heat_loss
+
+
+def part2(city: Grid) -> int:
+    start = city.index(0, 0)
+    end = city.index(city.width - 1, city.height - 1)
+    heat_loss, _ = least_heat_loss(city, start, end, min=4, max=10)
+    return heat_loss
 
 
 def main(lines: List[str]) -> None:
-    city = parse_input(lines)
-    part1(city)
-    part2(city)
+    city = parse(lines)
+    print("Part 1:", part1(city))
+    print("Part 2:", part2(city))
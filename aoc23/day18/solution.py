@@ -1,9 +1,11 @@
-from typing import Dict, List, Literal, Tuple, cast
+from typing import Dict, Iterable, List, Literal, Tuple, cast
 
 Direction = Literal["U", "D", "L", "R"]
 # (direction, steps, hex color)
 Instruction = Tuple[Direction, int]
 Coord = Tuple[int, int]
+# (instructions, hex colors)
+Input = Tuple[List[Instruction], List[str]]
 
 direction_to_coord: Dict[Direction, Coord] = {
     "U": (0, -1),
@@ -13,19 +15,14 @@ direction_to_coord: Dict[Direction, Coord] = {
 }
 
 
-def parse_input(lines: List[str]) -> Tuple[List[Instruction], List[str]]:
-    return [
-        (
-            cast(Direction, parts[0]),
-            int(parts[1]),
-        )
-        for line in lines
-        if (parts := line.strip().split(" "))
-    ], [
-        parts[2].removeprefix("(#").removesuffix(")")
-        for line in lines
-        if (parts := line.strip().split(" "))
-    ]
+def parse(lines: Iterable[str]) -> Input:
+    instructions: List[Instruction] = []
+    hexes: List[str] = []
+    for line in lines:
+        parts = line.strip().split(" ")
+        instructions.append((cast(Direction, parts[0]), int(parts[1])))
+        hexes.append(parts[2].removeprefix("(#").removesuffix(")"))
+    return instructions, hexes
 
 
 def get_area(instructions: List[Instruction]) -> int:
@@ -40,23 +37,23 @@ def get_area(instructions: List[Instruction]) -> int:
     return int(area)
 
 
-def part1(instructions: List[Instruction]) -> None:
-    area = get_area(instructions)
-    print("Part 1:", area)
+def part1(input: Input) -> int:
+    instructions, _ = input
+    return get_area(instructions)
 
 
-def part2(hexes: List[str]) -> None:
+def part2(input: Input) -> int:
+    _, hexes = input
     # Hex consists of 6 digits, where the 5 digits are the distance and the last digit
     # is the direction
     # 0 = R, 1 = D, 2 = L, 3 = U
     instructions = [
         (cast(Direction, "RDLU"[int(hex[-1])]), int(hex[:-1], 16)) for hex in hexes
     ]
-    area = get_area(instructions)
-    print("Part 2:", area)
+    return get_area(instructions)
 
 
 def main(lines: List[str]) -> None:
-    instructions, hex = parse_input(lines)
-    part1(instructions)
-    part2(hex)
+    input = parse(lines)
+    print("Part 1:", part1(input))
+    print("Part 2:", part2(input))
@@ -1,5 +1,6 @@
-import re
-from typing import Dict, List, Literal, Tuple, cast
+from typing import Dict, Iterable, List, Literal, Tuple, cast
+
+from aoc23.intervals import Box
 
 Operator = Literal[">", "<"]
 # (variable, operator, value, target rule) | (target rule)
@@ -8,23 +9,29 @@ Rule = Tuple[str, Operator, int, str] | str
 Workflows = Dict[str, List[Rule]]
 # Collection of variables
 Parts = List[Dict[str, int]]
+Input = Tuple[Workflows, Parts]
 
 # Workflows are in the format <name>{<variable><operator><value>:<target rule>, ...}
-workflow_regex = re.compile(r"(\w+){(.+)}")
-rule_regex = re.compile(r"(\w)(<|>)(\d+):(\w+)")
+workflow_regex = r"(\w+){(.+)}"
+rule_regex = r"(\w)(<|>)(\d+):(\w+)"
+
 
+def parse(lines: Iterable[str]) -> Input:
+    import re
 
-def parse_input(lines: List[str]) -> Tuple[Workflows, Parts]:
-    break_index = lines.index("\n")
+    rows = iter(lines)
     workflows: Workflows = {}
-    for workflow in lines[:break_index]:
-        workflow_match = workflow_regex.match(workflow.strip())
+    # Workflows come first, until the empty line
+    for workflow in rows:
+        if workflow.strip() == "":
+            break
+        workflow_match = re.match(workflow_regex, workflow.strip())
         assert workflow_match is not None
         workflow_name = workflow_match.group(1)
         rules = workflow_match.group(2).split(",")
         # All except last rule
         for rule in rules[:-1]:
-            rule_match = rule_regex.match(rule)
+            rule_match = re.match(rule_regex, rule)
             assert rule_match is not None
             assert len(rule_match.groups()) == 4
             variable, operator, value, target_rule = rule_match.groups()
@@ -35,7 +42,7 @@ def parse_input(lines: List[str]) -> Tuple[Workflows, Parts]:
         workflows.setdefault(workflow_name, []).append(rules[-1])
 
     parts: Parts = []
-    for parts_dict_str in lines[break_index + 1 :]:
+    for parts_dict_str in rows:
         parts_dict_str = parts_dict_str.strip().removeprefix("{").removesuffix("}")
         parts_str = parts_dict_str.split(",")
         parts.append(
@@ -45,7 +52,8 @@ def parse_input(lines: List[str]) -> Tuple[Workflows, Parts]:
     return workflows, parts
 
 
-def part1(workflows: Workflows, parts: Parts) -> None:
+def part1(input: Input) -> int:
+    workflows, parts = input
     accepted: Parts = []
     for rating in parts:
         current = "in"
@@ -68,78 +76,44 @@ def part1(workflows: Workflows, parts: Parts) -> None:
             accepted.append(rating)
 
     # Sum all the values of the accepted parts
-    result = sum(sum(part.values()) for part in accepted)
-    print("Part 1:", result)
-
-
-def part2(workflows: Workflows) -> None:
-    # We need to reverse the workflows to determine the possible values for each
-    # variable for it to reach A
-    Range = Tuple[int, int]
-    # (x, m, a, s)
-    Ranges = List[Range]
-
-    def variable_to_index(variable: str) -> int:
-        return "xmas".index(variable)
-
-    def adjust_ranges(
-        variable: str, operator: Operator, value: int, ranges: List[Ranges]
-    ) -> List[Ranges]:
-        """
-        Adjust the ranges so that the given condition is true
-        """
-        index = variable_to_index(variable)
-        for range in ranges:
-            low, high = range[index]
-            if operator == ">":
-                low = max(low, value + 1)
-            elif operator == "<":
-                high = min(high, value - 1)
-            if low > high:
-                continue
-            range[index] = (low, high)
-        return ranges
-
-    def dfs_inner(rules: List[Rule]) -> List[Ranges]:
-        rule = rules[0]
-        if isinstance(rule, str):
-            # This is a target rule, use the outer function
-            return dfs(rule)
-        rest = rules[1:]
-        variable, operator, value, target_rule = rule
-
-        # This will be the result if the condition is true
-        if_true = adjust_ranges(variable, operator, value, dfs(target_rule))
-
-        # This will be the result if the condition is false
-        # Inverse the operator and value
-        inverse_operator: Operator = ">" if operator == "<" else "<"
-        inverse_value = value - 1 if operator == "<" else value + 1
-        if_false = adjust_ranges(
-            variable, inverse_operator, inverse_value, dfs_inner(rest)
-        )
+    return sum(sum(part.values()) for part in accepted)
 
-        return if_true + if_false
 
-    def dfs(workflow_name: str) -> List[Ranges]:
+def part2(input: Input) -> int:
+    workflows, _ = input
+
+    def count_accepted(workflow_name: str, box: Box) -> int:
+        # The number of parts in the box of (x, m, a, s) ratings that reach A
         if workflow_name == "R":
-            return []
+            return 0
         if workflow_name == "A":
-            return [[(1, 4000), (1, 4000), (1, 4000), (1, 4000)]]
-        return dfs_inner(workflows[workflow_name])
-
-    result = 0
-    for range in dfs("in"):
-        value = 1
-        # Multiply the ranges together to get the number of possible values
-        for low, high in range:
-            value *= high - low + 1
-        result += value
-
-    print("Part 2:", result)
+            return box.volume()
+        result = 0
+        for rule in workflows[workflow_name]:
+            if isinstance(rule, str):
+                # This is a target rule, the rest of the box goes there
+                return result + count_accepted(rule, box)
+            variable, operator, value, target_rule = rule
+            axis = "xmas".index(variable)
+            # Split the box into the part where the condition is true, which goes
+            # to the target rule, and the rest, which goes to the next rule
+            matched: Box | None
+            rest: Box | None
+            if operator == "<":
+                matched, rest = box.split(axis, value)
+            else:
+                rest, matched = box.split(axis, value + 1)
+            if matched is not None:
+                result += count_accepted(target_rule, matched)
+            if rest is None:
+                return result
+            box = rest
+        return result
+
+    return count_accepted("in", Box([(1, 4001)] * 4))
 
 
 def main(lines: List[str]) -> None:
-    workflows, parts = parse_input(lines)
-    part1(workflows, parts)
-    part2(workflows)
+    input = parse(lines)
+    print("Part 1:", part1(input))
+    print("Part 2:", part2(input))
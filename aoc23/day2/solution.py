@@ -1,11 +1,16 @@
-import functools
-import re
-from typing import Dict, List, Literal
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, repeat
+from operator import itemgetter, mul
+from typing import Dict, Iterable, List, Literal, Tuple
+
+from aoc23.utils import run_cached
 
 Cube = Literal["red"] | Literal["blue"] | Literal["green"]
-cubes: List[Cube] = ["red", "blue", "green"]
+cubes: List[Cube] = ["red", "green", "blue"]
 Bag = Dict[Cube, int]
-Game = List[Bag]
+# A count per game or draw of each cube, in the order of cubes
+Columns = Tuple["array[int]", "array[int]", "array[int]"]
 
 initial: Bag = {
     "red": 12,
@@ -14,63 +19,184 @@ initial: Bag = {
 }
 
 
-def part1(games: List[Game]) -> None:
-    def is_valid_set(bag: Bag) -> bool:
-        return all(bag[cube] <= initial[cube] for cube in bag)
-
-    def is_valid_game(game: Game) -> bool:
-        return all(is_valid_set(set) for set in game)
-
-    result = sum([index + 1 for index, game in enumerate(games) if is_valid_game(game)])
+class Games:
+    # Every draw of every game in flat columns, the number of cubes of each colour.
+    # The draws of game i are draws offsets[i] up to offsets[i + 1]
+    def __init__(self, draws: Columns, offsets: "array[int]") -> None:
+        self.draws = draws
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+@run_cached
+def get_min_bags(games: Games) -> Columns:
+    # The fewest cubes of each colour every game could have been played with, which
+    # is all both parts need. The maximum of each game's slice of a column
+    slices = list(map(slice, games.offsets[:-1], games.offsets[1:]))
+    red, green, blue = (
+        array("q", map(max, map(column.__getitem__, slices))) for column in games.draws
+    )
+    return red, green, blue
+
+
+# (green, blue, number of games, sum of their IDs)
+PlanePoint = Tuple[int, int, int, int]
+
+
+class PlaneIndex:
+    # The number of games and the sum of their IDs of the points with green <= G and
+    # blue <= B. The points are sorted by green, and level L has their blues sorted
+    # within blocks of 2^L points, with running sums of the numbers and IDs over the
+    # level. A green prefix is covered by at most one block per level, each searched
+    # with bisect
+    def __init__(self, points: List[PlanePoint]) -> None:
+        points = sorted(points)
+        self.greens = array("q", (point[0] for point in points))
+        blues = [point[1] for point in points]
+        counts = [point[2] for point in points]
+        ids = [point[3] for point in points]
+        self.levels: List[Tuple["array[int]", "array[int]", "array[int]"]] = []
+        # The points of each block, sorted by blue
+        order = list(range(len(points)))
+        width = 1
+        while width <= len(points):
+            if width > 1:
+                order = [
+                    index
+                    for start in range(0, len(order), width)
+                    for index in sorted(
+                        order[start : start + width], key=blues.__getitem__
+                    )
+                ]
+            self.levels.append(
+                (
+                    array("q", map(blues.__getitem__, order)),
+                    array("q", accumulate(map(counts.__getitem__, order), initial=0)),
+                    array("q", accumulate(map(ids.__getitem__, order), initial=0)),
+                )
+            )
+            width *= 2
+
+    def query(self, green: int, blue: int) -> Tuple[int, int]:
+        count = id_sum = start = 0
+        stop = bisect_right(self.greens, green)
+        # The largest blocks first, so start is always at the start of a block
+        for level in reversed(range(len(self.levels))):
+            width = 1 << level
+            if stop - start >= width:
+                blues, counts, ids = self.levels[level]
+                index = bisect_right(blues, blue, start, start + width)
+                count += counts[index] - counts[start]
+                id_sum += ids[index] - ids[start]
+                start += width
+        return count, id_sum
+
+
+class BagIndex:
+    # Which games are possible with any bag, as (the number of games, the sum of
+    # their IDs), a game is possible if the bag dominates its fewest cubes. Games
+    # with the same fewest cubes are one point, and as cube counts are small there
+    # are far fewer points than games. Points are sorted by red, and a Fenwick tree
+    # over that order has a PlaneIndex of green and blue per node, so a query is
+    # O(log^2 n) bisects and the index O(n log^2 n) memory, for n points
+    def __init__(self, min_bags: Columns) -> None:
+        totals: Dict[Tuple[int, int, int], Tuple[int, int]] = {}
+        for game_id, bag in enumerate(zip(*min_bags), start=1):
+            count, id_sum = totals.get(bag, (0, 0))
+            totals[bag] = (count + 1, id_sum + game_id)
+        points = sorted(totals)
+        self.reds = array("q", (point[0] for point in points))
+        # Node i covers the points i - (i & -i) up to i in red order
+        self.planes = [PlaneIndex([])] + [
+            PlaneIndex(
+                [
+                    (green, blue, *totals[red, green, blue])
+                    for red, green, blue in points[index - (index & -index) : index]
+                ]
+            )
+            for index in range(1, len(points) + 1)
+        ]
+
+    def query(self, bag: Bag) -> Tuple[int, int]:
+        count = id_sum = 0
+        index = bisect_right(self.reds, bag["red"])
+        while index > 0:
+            plane_count, plane_id_sum = self.planes[index].query(
+                bag["green"], bag["blue"]
+            )
+            count += plane_count
+            id_sum += plane_id_sum
+            index -= index & -index
+        return count, id_sum
+
+    def query_all(self, bags: Iterable[Bag]) -> List[Tuple[int, int]]:
+        # Bags that are asked for more than once are answered once
+        answers: Dict[Tuple[int, int, int], Tuple[int, int]] = {}
+        result = []
+        for bag in bags:
+            key = (bag["red"], bag["green"], bag["blue"])
+            if key not in answers:
+                answers[key] = self.query(bag)
+            result.append(answers[key])
+        return result
+
+
+@run_cached
+def get_bag_index(games: Games) -> BagIndex:
+    return BagIndex(get_min_bags(games))
+
+
+def possible_games(games: Games, bags: Iterable[Bag]) -> List[Tuple[int, int]]:
+    # (the number of games, the sum of their IDs) possible with each bag, from an
+    # index that is built once per run. Part 1 asks for a single bag, which a scan
+    # of the fewest cubes answers without building the index
+    return get_bag_index(games).query_all(bags)
+
+
+def part1(games: Games) -> int:
+    red, green, blue = get_min_bags(games)
+    return sum(
+        index
+        for index, (min_red, min_green, min_blue) in enumerate(
+            zip(red, green, blue), start=1
+        )
+        if min_red <= initial["red"]
+        and min_green <= initial["green"]
+        and min_blue <= initial["blue"]
+    )
+
+
+def part2(games: Games) -> int:
+    red, green, blue = get_min_bags(games)
+    return sum(map(mul, map(mul, red, green), blue))
 
-    print(f"Part 1: {result}")
 
+def main(input: List[str]) -> None:
+    games = parse(input)
+    print(f"Part 1: {part1(games)}")
+    print(f"Part 2: {part2(games)}")
 
-def part2(games: List[Game]) -> None:
-    def reduce(prev: Bag, bag: Bag) -> Bag:
-        return {
-            "red": max(prev["red"], bag["red"]),
-            "green": max(prev["green"], bag["green"]),
-            "blue": max(prev["blue"], bag["blue"]),
-        }
-
-    initial: Bag = {
-        "red": 0,
-        "green": 0,
-        "blue": 0,
-    }
 
-    def get_min_bag_sum(game: Game) -> int:
-        min_bag = functools.reduce(reduce, game, initial)
-        return min_bag["blue"] * min_bag["green"] * min_bag["red"]
+# Appended to every draw, so every colour is found in every draw
+missing_cubes = "".join(f", 0 {cube}" for cube in cubes)
 
-    result = sum([get_min_bag_sum(game) for game in games])
 
-    print(f"Part 2: {result}")
+def parse(input: Iterable[str]) -> Games:
+    # One pass over the whole log with string methods, all in C. Draws are split on
+    # ";", and the count of a colour is the word before the first " red" etc. of the
+    # draw. Draws without a colour find the 0 of missing_cubes instead
+    bodies = [line.partition(": ")[2] for line in input]
+    log = "".join(body + ";" for body in bodies)
+    draws = log.replace(";", missing_cubes + ";").split(";")
+    draws.pop()
 
+    def get_column(cube: Cube) -> "array[int]":
+        heads = map(itemgetter(0), map(str.partition, draws, repeat(f" {cube}")))
+        words = map(itemgetter(2), map(str.rpartition, heads, repeat(" ")))
+        return array("q", map(int, words))
 
-def main(input: List[str]) -> None:
-    games = parse_input(input)
-    part1(games)
-    part2(games)
-
-
-def parse_input(input: List[str]) -> List[Game]:
-    def create_set(set: str) -> Bag:
-        bag: Bag = {}
-        for cube in cubes:
-            regex = r"(\d+) " + cube
-            match = re.search(regex, set)
-            if match is None:
-                bag[cube] = 0
-                continue
-            bag[cube] = int(match.group(1))
-        return bag
-
-    def create_game(game: str) -> Game:
-        sets = game.split(";")
-        return [create_set(set) for set in sets]
-
-    result: List[Game] = [create_game(game) for game in input]
-
-    return result
+    red, green, blue = (get_column(cube) for cube in cubes)
+    counts = (body.count(";") + 1 for body in bodies)
+    return Games((red, green, blue), array("q", accumulate(counts, initial=0)))
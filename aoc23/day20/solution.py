@@ -1,5 +1,7 @@
-from copy import deepcopy
-from typing import Dict, List, Literal, Tuple, cast
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Literal, Optional, Tuple, cast
+
+from aoc23.utils import count
 
 Pulse = Literal["high", "low"]
 FlipFlopState = Literal["on", "off"]
@@ -14,7 +16,7 @@ Module = (
 States = Dict[str, Module]
 
 
-def parse_input(lines: List[str]) -> States:
+def parse(lines: Iterable[str]) -> States:
     states: States = {}
     for line in lines:
         module, targets_str = line.strip().split(" -> ")
@@ -41,16 +43,25 @@ def parse_input(lines: List[str]) -> States:
     return states
 
 
+# Presses of the button until each module feeding the module feeding rx sent a high
+# pulse, None until it has
+Checks = Dict[str, int | None]
+# (low pulses and high pulses of the first 1000 presses, the checks, or None if
+# they were not asked for or nothing feeds rx, like in the examples)
+Simulation = Tuple[int, int, Checks | None]
+
+
 # The signals needs to be sent in a BFS manner.
 # I.e. send all signals to all targets, then send all signals to all targets of
 # those targets, etc.
-def bfs(states: States) -> Tuple[States, int, int]:
+def press_button(states: States, presses: int, checks: Checks) -> Tuple[int, int]:
+    # Returns the number of low and high pulses sent, and updates the checks
     low_pulses = 0
     high_pulses = 0
     # Start by sending low pulse to broadcaster
-    queue: List[Tuple[str, str, Pulse]] = [("button", "broadcaster", "low")]
+    queue: Deque[Tuple[str, str, Pulse]] = deque([("button", "broadcaster", "low")])
     while queue:
-        sender, current, signal = queue.pop(0)
+        sender, current, signal = queue.popleft()
         # print(f"{sender} -{signal}-> {current}")
         if signal == "low":
             low_pulses += 1
@@ -97,95 +108,16 @@ def bfs(states: States) -> Tuple[States, int, int]:
                 )
                 else "high"
             )
+            if next_signal == "high" and checks.get(current, 0) is None:
+                checks[current] = presses
             targets = current_module[2]
             for target in targets:
                 queue.append((current, target, next_signal))
 
-    return states, low_pulses, high_pulses
-
-
-def part1(states: States) -> None:
-    states = deepcopy(states)
-    low_pulses = 0
-    high_pulses = 0
-    for _ in range(1000):
-        states, low, high = bfs(states)
-        low_pulses += low
-        high_pulses += high
-
-    # print("Low pulses", low_pulses)
-    # print("High pulses", high_pulses)
-    print(
-        "Part 1",
-        low_pulses * high_pulses,
-    )
-
-
-def bfs2(
-    states: States, presses: int, modules_to_check: Dict[str, int | None]
-) -> Tuple[States, Dict[str, int | None]]:
-    # Start by sending low pulse to broadcaster
-    queue: List[Tuple[str, str, Pulse]] = [("button", "broadcaster", "low")]
-    while queue:
-        sender, current, signal = queue.pop(0)
-        # print(f"{sender} -{signal}-> {current}")
-
-        if current not in states:
-            continue
-        current_module = states[current]
-        if current_module[0] == "broadcaster":
-            targets = current_module[1]
-            # Broadcast the signal to all targets
-            for target in targets:
-                queue.append((current, target, signal))
-        elif current_module[0] == "flip-flop":
-            if signal == "high":
-                # If flip-flop receives high, nothing happens
-                continue
-            state = current_module[1]
-            targets = current_module[2]
-            # If flip flop receives low
-            # If flip flop is off, turn on and send high
-            # If flip flop is on, turn off and send low
-            next_state: FlipFlopState = "on" if state == "off" else "off"
-            next_signal: Pulse = "high" if state == "off" else "low"
-            states[current] = (
-                "flip-flop",
-                next_state,
-                current_module[2],
-            )
-            for target in targets:
-                queue.append((current, target, next_signal))
-
-        elif current_module[0] == "conjunction":
-            # First update the memory
-            cast(Conjunction, current_module[1])[sender] = signal
-            # Send low pulse to all targets if all signals are high
-            # Otherwise send high
-            next_signal = (
-                "low"
-                if all(
-                    input == "high"
-                    for input in cast(Conjunction, current_module[1]).values()
-                )
-                else "high"
-            )
-            if (
-                next_signal == "high"
-                and current in modules_to_check
-                and modules_to_check[current] is None
-            ):
-                modules_to_check[current] = presses
-            targets = current_module[2]
-            for target in targets:
-                queue.append((current, target, next_signal))
-
-    return states, modules_to_check
+    return low_pulses, high_pulses
 
 
-def part2(states: States) -> None:
-    states = deepcopy(states)
-
+def get_checks(states: States) -> Checks | None:
     # rx is only pointed from one module, which is a conjunction of conjunctions
     # create a map of when all of the conjunctions are high
     module_to_rx: str | None = None
@@ -193,21 +125,52 @@ def part2(states: States) -> None:
         if state[0] == "conjunction" and "rx" in state[2]:
             module_to_rx = key
             break
-    assert module_to_rx is not None
-    modules_to_check: Dict[str, int | None] = {}
+    if module_to_rx is None:
+        return None
+    checks: Checks = {}
     for key, state in states.items():
         if state[0] == "conjunction" and module_to_rx in state[2]:
-            modules_to_check[key] = None
+            checks[key] = None
+    return checks
 
-    button_presses = 0
-    while True:
-        button_presses += 1
-        states, modules_to_check = bfs2(states, button_presses, modules_to_check)
-        if all(v is not None for v in modules_to_check.values()):
-            break
+
+def simulate(states: States, until_checks: bool) -> Simulation:
+    # The first 1000 presses, and with until_checks the presses until every check
+    # is done. Part 1 does not share part 2's simulation, which takes far longer
+    from copy import deepcopy
+
+    states = deepcopy(states)
+    checks = get_checks(states) if until_checks else None
+    low_pulses = 0
+    high_pulses = 0
+    presses = 0
+    while presses < 1000 or (
+        checks is not None and any(v is None for v in checks.values())
+    ):
+        presses += 1
+        low, high = press_button(states, presses, checks or {})
+        if presses <= 1000:
+            low_pulses += low
+            high_pulses += high
+    count("day20 button presses", presses)
+    count("day20 pulses", low_pulses + high_pulses)
+    return low_pulses, high_pulses, checks
+
+
+def part1(states: States) -> int:
+    low_pulses, high_pulses, _ = simulate(states, False)
+    return low_pulses * high_pulses
+
+
+def part2(states: States) -> Optional[int]:
+    # Inputs where nothing feeds rx, like the examples, have no part 2
+    if get_checks(states) is None:
+        return None
+    _, _, checks = simulate(states, True)
+    assert checks is not None
 
     # Get all of the values from the modules
-    values = [v for v in modules_to_check.values() if v is not None]
+    values = [v for v in checks.values() if v is not None]
 
     # Get the lowest common multiple of all of the values
     def gcd(a: int, b: int) -> int:
@@ -219,12 +182,12 @@ def part2(states: States) -> None:
     for i in values[1:]:
         lcm = lcm * i // gcd(lcm, i)
 
-    # print("Low pulses", low_pulses)
-    # print("High pulses", high_pulses)
-    print("Part 2", lcm)
+    return lcm
 
 
 def main(lines: List[str]) -> None:
-    input = parse_input(lines)
-    part1(input)
-    part2(input)
+    input = parse(lines)
+    print("Part 1:", part1(input))
+    presses = part2(input)
+    if presses is not None:
+        print("Part 2:", presses)
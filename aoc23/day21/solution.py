@@ -1,93 +1,59 @@
-from typing import Dict, List, Literal, Tuple, cast
-
-Coord = Tuple[int, int]
-Cell = Literal[".", "#"]
-Grid = List[List[Cell]]
-
-
-def parse_input(input: List[str]) -> Tuple[Grid, Coord]:
-    grid: Grid = []
-    start: Coord | None = None
-    for y, line in enumerate(input):
-        row: List[Cell] = []
-        for x, c in enumerate(line.strip()):
-            if c == "S":
-                start = (x, y)
-                row.append(".")
-                continue
-            row.append(cast(Cell, c))
-        grid.append(row)
-
-    assert start is not None
+from typing import Iterable, List, Tuple
+
+from aoc23.search import UNREACHED, bfs, count_stats
+from aoc23.utils import Grid
+
+# (garden, index of the start)
+Input = Tuple[Grid, int]
+
+
+def parse(input: Iterable[str]) -> Input:
+    # The border is rocks, so the walk never leaves the garden
+    grid = Grid(input, border="#")
+    start = grid.find("S")
+    grid.cells[start] = ord(".")
     return grid, start
 
 
-Distances = Dict[Coord, int]
-
-
-# Do BFS to get the distance to each cell in x steps
-def bfs(grid: Grid, steps: int, start: Coord) -> Distances:
-    queue: List[Tuple[Coord, int]] = [(start, 0)]
-    distances: Distances = {}
-    while queue:
-        coord, dist = queue.pop(0)
-        if coord in distances:
-            continue
-        distances[coord] = dist
-        x, y = coord
-        if dist == steps:
-            continue
-        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            new_coord = (x + dx, y + dy)
-            # Make sure that we don't go out of bounds
-            if (
-                new_coord[0] < 0
-                or new_coord[1] < 0
-                or new_coord[0] >= len(grid[0])
-                or new_coord[1] >= len(grid)
-            ):
-                continue
-            # Make sure that we don't go through walls
-            if grid[new_coord[1]][new_coord[0]] == "#":
-                continue
-
-            queue.append((new_coord, dist + 1))
-    return distances
-
-
-def part1(grid: Grid, start: Coord) -> None:
+# Do BFS to get the distances of the cells reached in x steps
+def get_distances(grid: Grid, steps: int, start: int) -> List[int]:
+    cells = grid.cells
+    rock = ord("#")
+
+    def neighbours(index: int) -> List[int]:
+        # Make sure that we don't go through walls
+        return [index + o for o in grid.offsets if cells[index + o] != rock]
+
+    distances, stats = bfs([start], neighbours, len(cells), steps)
+    count_stats("day21 bfs", stats)
+    return [distance for distance in distances if distance != UNREACHED]
+
+
+def part1(input: Input) -> int:
+    grid, start = input
     steps = 64
     parity = steps % 2
-    distances = bfs(grid, steps, start)
+    distances = get_distances(grid, steps, start)
     # Get all that have the same parity
-    reachable = set(coord for coord, dist in distances.items() if dist % 2 == parity)
-
-    print("Part 1:", len(reachable))
+    return sum(1 for dist in distances if dist % 2 == parity)
 
 
-def part2(grid: Grid, start: Coord) -> None:
+def part2(input: Input) -> int:
+    grid, start = input
     # Number of steps
     steps = 26501365
     # The length of our input data
-    length = len(grid)
+    length = grid.height
     # Get all the distances
-    distances = bfs(grid, length, start)
+    distances = get_distances(grid, length, start)
 
     # Get the corners, they are the ones that take more than the length / 2 to reach
-    even_corners = set(
-        coord
-        for coord, dist in distances.items()
-        if dist % 2 == 0 and dist > length // 2
-    )
-    odd_corners = set(
-        coord
-        for coord, dist in distances.items()
-        if dist % 2 == 1 and dist > length // 2
-    )
+    even_corners = [d for d in distances if d % 2 == 0 and d > length // 2]
+    odd_corners = [d for d in distances if d % 2 == 1 and d > length // 2]
 
     # Get all the even and odd cells
-    even = set(coord for coord, dist in distances.items() if dist % 2 == 0)
-    odd = set(coord for coord, dist in distances.items() if dist % 2 == 1)
+    even = [d for d in distances if d % 2 == 0]
+    odd = [d for d in distances if d % 2 == 1]
 
     # ((steps - (length / 2)) / length) is the number of grids we reach in
     # one direction
@@ -105,10 +71,10 @@ def part2(grid: Grid, start: Coord) -> None:
         + n * len(even_corners)
     )
 
-    print("Part 2:", result)
+    return result
 
 
 def main(lines: List[str]) -> None:
-    grid, start = parse_input(lines)
-    part1(grid, start)
-    part2(grid, start)
+    input = parse(lines)
+    print("Part 1:", part1(input))
+    print("Part 2:", part2(input))
@@ -1,78 +1,78 @@
-from typing import Dict, List, Set, Tuple
+from typing import Dict, Iterable, List, Set, Tuple
 
+from aoc23.intervals import Box, Interval
+from aoc23.utils import Span, get_integers
 
-def range_intersection(a: range, b: range) -> bool:
-    return bool(range(max(a.start, b.start), min(a.stop, b.stop)))
+# Axes of a brick
+X, Y, Z = 0, 1, 2
 
 
-Brick = Tuple[range, range, range]
+def range_intersection(a: Interval, b: Interval) -> bool:
+    return max(a[0], b[0]) < min(a[1], b[1])
 
 
-def brick_fall_down(brick: Brick) -> Brick:
-    return (brick[0], brick[1], range(brick[2].start - 1, brick[2].stop - 1))
+Brick = Box
 
 
-def intersects(brick1: Brick, brick2: Brick) -> bool:
-    return (
-        range_intersection(brick1[0], brick2[0])
-        and range_intersection(brick1[1], brick2[1])
-        and range_intersection(brick1[2], brick2[2])
-    )
+def brick_fall_down(brick: Brick) -> Brick:
+    return brick.translate(Z, -1)
 
 
 def is_directly_above(brick1: Brick, brick2: Brick) -> bool:
     return (
-        range_intersection(brick1[0], brick2[0])
-        and range_intersection(brick1[1], brick2[1])
-        and brick1[2].start == brick2[2].stop
+        range_intersection(brick1[X], brick2[X])
+        and range_intersection(brick1[Y], brick2[Y])
+        and brick1[Z][0] == brick2[Z][1]
     )
 
 
 def is_directly_below(brick1: Brick, brick2: Brick) -> bool:
     return (
-        range_intersection(brick1[0], brick2[0])
-        and range_intersection(brick1[1], brick2[1])
-        and brick1[2].stop == brick2[2].start
+        range_intersection(brick1[X], brick2[X])
+        and range_intersection(brick1[Y], brick2[Y])
+        and brick1[Z][1] == brick2[Z][0]
     )
 
 
-def parse_input(input: List[str]) -> List[Brick]:
+@Span("parse_bricks")
+def parse_bricks(input: Iterable[str]) -> List[Brick]:
     bricks: List[Brick] = []
 
-    for line in input:
-        parts = line.strip().split("~")
+    for x1, y1, z1, x2, y2, z2 in get_integers(input).rows():
+        bricks.append(Box([(x1, x2 + 1), (y1, y2 + 1), (z1, z2 + 1)]))
 
-        x1, y1, z1 = parts[0].split(",")
-        x2, y2, z2 = parts[1].split(",")
+    return bricks
 
-        bricks.append(
-            (
-                range(int(x1), int(x2) + 1),
-                range(int(y1), int(y2) + 1),
-                range(int(z1), int(z2) + 1),
-            )
-        )
 
-    return bricks
+def get_layers(bricks: List[Brick]) -> Dict[int, List[Brick]]:
+    # Height -> bricks with a cube at that height, only bricks that share a height
+    # can intersect
+    layers: Dict[int, List[Brick]] = {}
+    for brick in bricks:
+        for z in range(*brick[Z]):
+            layers.setdefault(z, []).append(brick)
+    return layers
 
 
+@Span("fall_down")
 def fall_down(bricks: List[Brick]) -> Tuple[List[Brick], bool]:
     # Make brick fall down if not
     # 1. Its on the ground
     # 2. It intersects with another brick
 
+    layers = get_layers(bricks)
     new_bricks: List[Brick] = []
     did_change = False
     for brick in bricks:
-        if brick[2].start == 0:
+        if brick[Z][0] == 0:
             new_bricks.append(brick)
             continue
         next_brick = brick_fall_down(brick)
         does_intersect = False
-        for other in bricks:
+        for other in (other for z in range(*brick[Z]) for other in layers[z]):
             if brick == other:
                 continue
-            if intersects(brick, other):
+            if brick.intersects(other):
                 does_intersect = True
                 break
         if not does_intersect:
@@ -85,16 +85,26 @@ def fall_down(bricks: List[Brick]) -> Tuple[List[Brick], bool]:
 
 
 SupportMap = Dict[Brick, Set[Brick]]
+# (settled bricks, bricks supported by each brick, bricks supporting each brick)
+Input = Tuple[List[Brick], SupportMap, SupportMap]
 
 
+@Span("get_support_map")
 def get_support_map(bricks: List[Brick]) -> Tuple[SupportMap, SupportMap]:
     # For each brick, find all bricks that support it
     support_map: SupportMap = {}
     supported_by: SupportMap = {}
+    # Only bricks that end where a brick starts, or start where it ends, can touch it
+    by_start: Dict[int, List[Brick]] = {}
+    by_stop: Dict[int, List[Brick]] = {}
+    for brick in bricks:
+        by_start.setdefault(brick[Z][0], []).append(brick)
+        by_stop.setdefault(brick[Z][1], []).append(brick)
     for brick in bricks:
         support_map[brick] = set()
         supported_by[brick] = set()
-        for other in bricks:
+        touching = by_stop.get(brick[Z][0], []) + by_start.get(brick[Z][1], [])
+        for other in touching:
             if brick == other:
                 continue
             if is_directly_above(brick, other):
@@ -105,9 +115,17 @@ def get_support_map(bricks: List[Brick]) -> Tuple[SupportMap, SupportMap]:
     return support_map, supported_by
 
 
-def part1(
-    bricks: List[Brick], support_map: SupportMap, supported_by: SupportMap
-) -> None:
+def parse(lines: Iterable[str]) -> Input:
+    bricks = parse_bricks(lines)
+    did_change = True
+    while did_change:
+        bricks, did_change = fall_down(bricks)
+    support_map, supported_by = get_support_map(bricks)
+    return bricks, support_map, supported_by
+
+
+def part1(input: Input) -> int:
+    bricks, support_map, supported_by = input
     count = 0
     # Find bricks that either does not support any other brick
     # or support bricks that are supported by other bricks
@@ -120,12 +138,11 @@ def part1(
         if all_supported:
             count += 1
 
-    print("Part 1:", count)
+    return count
 
 
-def part2(
-    bricks: List[Brick], support_map: SupportMap, supported_by: SupportMap
-) -> None:
+def part2(input: Input) -> int:
+    bricks, support_map, supported_by = input
     count = 0
     for brick in bricks:
         # Keep track of bricks that have fallen / been removed
@@ -142,14 +159,10 @@ def part2(
                 fallen.add(next_faller)
                 possible_fallers.update(support_map[next_faller])
         count += len(fallen) - 1
-    print("Part 2:", count)
+    return count
 
 
-def main(lines: List[str]) -> None:  #
-    bricks = parse_input(lines)
-    did_change = True
-    while did_change:
-        bricks, did_change = fall_down(bricks)
-    support_map, supported_by = get_support_map(bricks)
-    part1(bricks, support_map, supported_by)
-    part2(bricks, support_map, supported_by)
+def main(lines: List[str]) -> None:
+    input = parse(lines)
+    print("Part 1:", part1(input))
+    print("Part 2:", part2(input))
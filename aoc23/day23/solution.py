@@ -1,5 +1,8 @@
 import sys
-from typing import List, Literal, Set, Tuple, cast
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from aoc23 import utils
+from aoc23.utils import Grid, SharedPool, part_workers
 
 # # = forest
 # . = path
@@ -7,88 +10,138 @@ from typing import List, Literal, Set, Tuple, cast
 # v = down slope
 # < = left slope
 # > = right slope
-Cell = Literal["#", ".", "^", "v", "<", ">"]
-Coord = Tuple[int, int]
-Input = List[List[Cell]]
-
-
-def parse_input(input: List[str]) -> Input:
-    return [cast(List[Cell], list(line.strip())) for line in input]
+forest = ord("#")
+# Slope -> index into Grid.offsets of the direction it goes down in
+slopes: Dict[int, int] = {ord("^"): 0, ord(">"): 1, ord("v"): 2, ord("<"): 3}
 
 
-directions = {(0, -1), (0, 1), (-1, 0), (1, 0)}
+def parse(input: Iterable[str]) -> Grid:
+    # The border is forest, so paths never leave the map
+    return Grid(input, border="#")
 
 
-def get_neighbors(input: Input, coord: Coord) -> List[Coord]:
-    x, y = coord
-    neighbors = []
-    for dx, dy in directions:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < len(input[0]) and 0 <= ny < len(input) and input[ny][nx] != "#":
-            neighbors.append((nx, ny))
-    return neighbors
+def get_neighbors(input: Grid, index: int) -> List[int]:
+    return [
+        index + offset
+        for offset in input.offsets
+        if input.cells[index + offset] != forest
+    ]
 
 
 # Increase recursion limit
 sys.setrecursionlimit(10000)
 
 
-def find_longest_path(
-    input: Input,
-    part2: bool = False,
-    start: Coord = (1, 0),
-    visited: Set[Coord] = set(),
-) -> Set[Coord]:
-    current = start
-    while current[1] != len(input) - 1:
-        x, y = current
+def walk(
+    input: Grid, part2: bool, current: int, visited: Set[int]
+) -> Optional[List[int]]:
+    # Follows the path from current, adding it to visited, up to the end or a fork.
+    # The unvisited neighbors at the fork, none at the end and None at a dead end
+    # Any index in the last row is the end
+    end = input.index(0, input.height - 1)
+    while current < end:
         visited.add(current)
-        value = input[y][x]
+        value = input.cells[current]
         # If current is a slope, move in that direction
-        if not part2 and value in "^v<>":
-            if value == "^":
-                current = (x, y - 1)
-            elif value == "v":
-                current = (x, y + 1)
-            elif value == "<":
-                current = (x - 1, y)
-            elif value == ">":
-                current = (x + 1, y)
+        if not part2 and value in slopes:
+            current += input.offsets[slopes[value]]
             # If current is visited, we done fucked up
             if current in visited:
-                return set()
+                return None
             continue
         neighbors = get_neighbors(input, current)
         # Skip visited neighbors
         neighbors = [neighbor for neighbor in neighbors if neighbor not in visited]
-        # If we there are more possible neighbors, take the max of either direction
         if len(neighbors) > 1:
-            solutions = (
-                find_longest_path(input, part2, neighbor, visited.copy())
-                for neighbor in neighbors
-            )
-            # Return the solution which is the longest
-            return max(solutions, key=len)
+            return neighbors
 
         if len(neighbors) == 0:
-            return set()
+            return None
 
         current = neighbors[0]
 
-    return visited
+    return []
 
 
-def part1(input: Input) -> None:
-    longest_path = find_longest_path(input)
-    print("Part 1:", len(longest_path))
-
-
-def part2(input: Input) -> None:
-    longest_path = find_longest_path(input, True)
-    print("Part 2:", len(longest_path))
+def find_longest_path(
+    input: Grid,
+    part2: bool = False,
+    start: int | None = None,
+    visited: Set[int] | None = None,
+) -> Set[int]:
+    # Every search starts with its own visited set, so runs do not leak into
+    # each other
+    if visited is None:
+        visited = set()
+    current = input.index(1, 0) if start is None else start
+    neighbors = walk(input, part2, current, visited)
+    if neighbors is None:
+        return set()
+    # If we there are more possible neighbors, take the max of either direction
+    solutions = (
+        find_longest_path(input, part2, neighbor, visited.copy())
+        for neighbor in neighbors
+    )
+    # Return the solution which is the longest, or the path if it reached the end
+    return max(solutions, key=len, default=visited)
+
+
+# (start, visited before it) of a search that is yet to be done
+Branch = Tuple[int, Set[int]]
+
+
+def split_search(input: Grid, part2: bool, count: int) -> Tuple[int, List[Branch]]:
+    # Follows the first forks breadth first, until there are at least count
+    # branches left to search. The length of the longest path that already reached
+    # the end, and the branches
+    longest = 0
+    branches: List[Branch] = [(input.index(1, 0), set())]
+    while 0 < len(branches) < count:
+        next_branches: List[Branch] = []
+        for current, visited in branches:
+            neighbors = walk(input, part2, current, visited)
+            if neighbors is None:
+                continue
+            if len(neighbors) == 0:
+                longest = max(longest, len(visited))
+            next_branches.extend((neighbor, visited.copy()) for neighbor in neighbors)
+        branches = next_branches
+    return longest, branches
+
+
+def longest_branch(branches: List[Branch]) -> int:
+    # Runs in the workers of a SharedPool, with the grid and part as the context
+    input, part2 = utils.shared_context
+    return max(
+        (
+            len(find_longest_path(input, part2, start, visited))
+            for start, visited in branches
+        ),
+        default=0,
+    )
+
+
+def longest_path_length(input: Grid, part2: bool) -> int:
+    workers = part_workers()
+    if workers > 1:
+        # The branches after the first forks are searched in parallel. The grid is
+        # small, so it is sent as the context instead of shared
+        longest, branches = split_search(input, part2, workers * 4)
+        with SharedPool({}, (input, part2), workers) as pool:
+            return pool.map_reduce(longest_branch, branches, max, longest)
+
+    return len(find_longest_path(input, part2))
+
+
+def part1(input: Grid) -> int:
+    return longest_path_length(input, False)
+
+
+def part2(input: Grid) -> int:
+    return longest_path_length(input, True)
 
 
 def main(lines: List[str]) -> None:
-    input = parse_input(lines)
-    # part1(input)
-    part2(input)
+    input = parse(lines)
+    print("Part 1:", part1(input))
+    print("Part 2:", part2(input))
@@ -1,4 +1,9 @@
-from typing import List, Tuple
+import operator
+from array import array
+from typing import Iterable, List, Tuple
+
+from aoc23 import utils
+from aoc23.utils import SharedPool, get_integers, part_workers
 
 Coord = Tuple[int, int, int]
 Velocity = Coord
@@ -7,66 +12,102 @@ Hailstone = Tuple[Coord, Velocity]
 Input = List[Hailstone]
 
 
-def parse_line(lines: List[str]) -> Input:
+def parse(lines: Iterable[str]) -> Input:
     hailstones: Input = []
-    for line in lines:
-        starting, velocity = line.strip().split(" @ ")
-        x, y, z = starting.split(", ")
-        dx, dy, dz = velocity.split(", ")
-        hailstones.append(((int(x), int(y), int(z)), (int(dx), int(dy), int(dz))))
+    for x, y, z, dx, dy, dz in get_integers(lines).rows():
+        hailstones.append(((x, y, z), (dx, dy, dz)))
     return hailstones
 
 
-def part1(hailstones: Input) -> None:
-    # min = 7
-    # max = 27
-    min = 200_000_000_000_000
-    max = 400_000_000_000_000
-
-    def intersect(h1: Hailstone, h2: Hailstone) -> bool:
-        # Check that where these two lines intersect is within the test area
-        # Disregard the z axis
-        (x1, y1, _), (dx1, dy1, _) = h1
-        (x2, y2, _), (dx2, dy2, _) = h2
-
-        # Check if the lines are parallel
-        if dx1 * dy2 == dx2 * dy1:
-            return False
-        # Solve for t
-        t = (dx1 * (y2 - y1) + dy1 * (x1 - x2)) / (dx2 * dy1 - dx1 * dy2)
-        # Get the intersection point
-        x = x2 + t * dx2
-        y = y2 + t * dy2
-
-        # Check if intersection is in the past
-        if (
-            (x < x1 and dx1 > 0)
-            or (x > x1 and dx1 < 0)
-            or (y < y1 and dy1 > 0)
-            or (y > y1 and dy1 < 0)
-            or (x < x2 and dx2 > 0)
-            or (x > x2 and dx2 < 0)
-            or (y < y2 and dy2 > 0)
-            or (y > y2 and dy2 < 0)
-        ):
-            return False
-
-        # Check if the intersection is within the test area
-        if min <= x <= max and min <= y <= max:
-            return True
+# The test area, for the example it is 7 to 27
+MIN = 200_000_000_000_000
+MAX = 400_000_000_000_000
+
 
+def intersect(h1: Hailstone, h2: Hailstone) -> bool:
+    # Check that where these two lines intersect is within the test area
+    # Disregard the z axis
+    (x1, y1, _), (dx1, dy1, _) = h1
+    (x2, y2, _), (dx2, dy2, _) = h2
+
+    # Check if the lines are parallel
+    if dx1 * dy2 == dx2 * dy1:
         return False
+    # Solve for t
+    t = (dx1 * (y2 - y1) + dy1 * (x1 - x2)) / (dx2 * dy1 - dx1 * dy2)
+    # Get the intersection point
+    x = x2 + t * dx2
+    y = y2 + t * dy2
 
-    # Check how many hailstones intersect within the test area
+    # Check if intersection is in the past
+    if (
+        (x < x1 and dx1 > 0)
+        or (x > x1 and dx1 < 0)
+        or (y < y1 and dy1 > 0)
+        or (y > y1 and dy1 < 0)
+        or (x < x2 and dx2 > 0)
+        or (x > x2 and dx2 < 0)
+        or (y < y2 and dy2 > 0)
+        or (y > y2 and dy2 < 0)
+    ):
+        return False
+
+    # Check if the intersection is within the test area
+    if MIN <= x <= MAX and MIN <= y <= MAX:
+        return True
+
+    return False
+
+
+def count_intersections(hailstones: Input, indices: Iterable[int]) -> int:
+    # Intersections of each of the hailstones at the indices with the ones after it
     count = 0
-    for i, hailstone in enumerate(hailstones):
+    for i in indices:
+        hailstone = hailstones[i]
         for other in hailstones[(i + 1) :]:
             if intersect(hailstone, other):
                 count += 1
+    return count
+
+
+def count_shared_intersections(indices: List[int]) -> int:
+    # Runs in the workers of a SharedPool, on the hailstones in shared memory
+    values = utils.shared_buffers["hailstones"]
+    hailstones = [
+        (
+            (values[i], values[i + 1], values[i + 2]),
+            (values[i + 3], values[i + 4], values[i + 5]),
+        )
+        for i in range(0, len(values), 6)
+    ]
+    return count_intersections(hailstones, indices)
+
+
+def part1(hailstones: Input) -> int:
+    # Check how many hailstones intersect within the test area
+    workers = part_workers()
+    if workers > 1:
+        # The hailstones are shared as one flat array of x, y, z, dx, dy and dz
+        values = array(
+            "q",
+            [
+                value
+                for hailstone in hailstones
+                for coord in hailstone
+                for value in coord
+            ],
+        )
+        with SharedPool({"hailstones": values}, workers=workers) as pool:
+            # Interleave the long and short rows of pairs, so chunks take about as long
+            indices = list(range(len(hailstones)))
+            order = [i for pair in zip(indices, reversed(indices)) for i in pair][
+                : len(indices)
+            ]
+            return pool.map_reduce(count_shared_intersections, order, operator.add, 0)
 
-    print("Part 1:", count)
+    return count_intersections(hailstones, range(len(hailstones)))
 
 
 def main(lines: List[str]) -> None:
-    input = parse_line(lines)
-    part1(input)
+    input = parse(lines)
+    print("Part 1:", part1(input))
@@ -1,9 +1,13 @@
-from typing import List
+from typing import TYPE_CHECKING, Iterable, List
 
-import networkx as nx  # type: ignore
+if TYPE_CHECKING:
+    import networkx as nx  # type: ignore
 
 
-def parse_input(lines: List[str]) -> nx.Graph:
+def parse(lines: Iterable[str]) -> "nx.Graph":
+    # networkx is slow to import, so only import it when actually solving
+    import networkx as nx
+
     graph = nx.Graph()
     for line in lines:
         component, connections_str = line.strip().split(": ")
@@ -14,7 +18,11 @@ def parse_input(lines: List[str]) -> nx.Graph:
     return graph
 
 
-def part1(graph: nx.Graph) -> None:
+def part1(graph: "nx.Graph") -> int:
+    import networkx as nx
+
+    # Edges are removed below, so work on a copy of the parsed graph
+    graph = graph.copy()
     # Get the minimum edge cut
     edges = nx.minimum_edge_cut(graph)
     # Remove the edges from the graph
@@ -25,9 +33,9 @@ def part1(graph: nx.Graph) -> None:
     connected_components = list(nx.connected_components(graph))
     c1 = len(connected_components[0])
     c2 = len(connected_components[1])
-    print("Part 1:", c1 * c2)
+    return c1 * c2
 
 
 def main(lines: List[str]) -> None:
-    graph = parse_input(lines)
-    part1(graph)
+    graph = parse(lines)
+    print("Part 1:", part1(graph))
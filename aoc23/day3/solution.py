@@ -1,84 +1,67 @@
-from typing import Dict, List, Set, Tuple
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
 
-surrounding = [
-    [dx, dy] for dx in range(-1, 2) for dy in range(-1, 2) if not (dx == 0 and dy == 0)
-]
+from aoc23.utils import Grid
 
+dot = ord(".")
+star = ord("*")
 
-def part1(input: List[str]) -> None:
-    def is_part_number(x1: int, y1: int) -> bool:
-        for dx, dy in surrounding:
-            x = x1 + dx
-            y = y1 + dy
-            if x < 0 or y < 0 or y >= len(input) or x >= len(input[y]):
-                continue
-
-            if not input[y][x].isdigit() and input[y][x] != "." and input[y][x] != "\n":
-                return True
-
-        return False
-
-    result: List[int] = []
-    for row_i, row in enumerate(input):
-        current_number = ""
-        part_number_found = False
-        for char_i, char in enumerate(row):
-            if not char.isdigit():
-                if part_number_found and current_number != "":
-                    result.append(int(current_number))
-                current_number = ""
-                part_number_found = False
-                continue
 
-            current_number += char
-            if not part_number_found and is_part_number(char_i, row_i):
-                part_number_found = True
+def parse(lines: Iterable[str]) -> Grid:
+    return Grid(lines, border=".")
 
-    print(f"Part 1: {sum(result)}")
 
+def is_digit(cell: int) -> bool:
+    return 48 <= cell <= 57
 
-def part2(input: List[str]) -> None:
-    Coord = Tuple[int, int]
-    star_map: Dict[Coord, List[int]] = {}
 
-    def find_stars(x1: int, y1: int) -> List[Coord]:
-        stars: List[Coord] = []
-        for dx, dy in surrounding:
-            x = x1 + dx
-            y = y1 + dy
-            if x < 0 or y < 0 or y >= len(input) or x >= len(input[y]):
+def get_numbers(grid: Grid) -> Iterator[Tuple[int, Set[int]]]:
+    # Every number in the schematic, with the indices of the symbols around it
+    cells = grid.cells
+    for y in range(grid.height):
+        start = grid.index(0, y)
+        number = 0
+        in_number = False
+        symbols: Set[int] = set()
+        # The border after the row ends a number at the end of the row
+        for index in range(start, start + grid.width + 1):
+            cell = cells[index]
+            if not is_digit(cell):
+                if in_number:
+                    yield number, symbols
+                number = 0
+                in_number = False
+                symbols = set()
                 continue
 
-            if input[y][x] == "*":
-                stars.append((x, y))
-
-        return stars
-
-    for row_i, row in enumerate(input):
-        current_number = ""
-        stars: Set[Coord] = set()
-        for char_i, char in enumerate(row):
-            if not char.isdigit():
-                if current_number != "":
-                    for star in stars:
-                        if star not in star_map:
-                            star_map[star] = []
-                        star_map[star].append(int(current_number))
-                current_number = ""
-                stars = set()
-                continue
+            number = number * 10 + cell - 48
+            in_number = True
+            for offset in grid.surrounding:
+                neighbour = cells[index + offset]
+                if not is_digit(neighbour) and neighbour != dot:
+                    symbols.add(index + offset)
+
+
+def part1(grid: Grid) -> int:
+    return sum(number for number, symbols in get_numbers(grid) if symbols)
+
+
+def part2(grid: Grid) -> int:
+    star_map: Dict[int, List[int]] = {}
+    for number, symbols in get_numbers(grid):
+        for symbol in symbols:
+            if grid.cells[symbol] == star:
+                star_map.setdefault(symbol, []).append(number)
 
-            current_number += char
-            stars.update(find_stars(char_i, row_i))
     result = 0
     for numbers in star_map.values():
         if len(numbers) != 2:
             continue
         result += numbers[0] * numbers[1]
 
-    print(f"Part 2: {result}")
+    return result
 
 
-def main(input: List[str]) -> None:
-    part1(input)
-    part2(input)
+def main(lines: List[str]) -> None:
+    input = parse(lines)
+    print(f"Part 1: {part1(input)}")
+    print(f"Part 2: {part2(input)}")
@@ -1,46 +1,54 @@
-import re
-from typing import List, Set
+from typing import Iterable, List, Set, Tuple
 
-regex = r"Card\s+\d+: (.*) \| (.*)"
+from aoc23.utils import Integers, get_integers, run_cached
 
+# (the numbers of every card, the number of winning numbers on a card)
+Input = Tuple[Integers, int]
 
-def get_winning_hand(row: str) -> Set[int]:
-    match = re.match(regex, row)
-    if match is None:
-        return set()
-    winners = set(
-        int(number) for number in match.group(1).strip().split(" ") if number != ""
-    )
-    hand = set(
-        int(number) for number in match.group(2).strip().split(" ") if number != ""
-    )
-    return hand.intersection(winners)
 
+def get_winning_hand(row: List[int], winners: int) -> Set[int]:
+    # A row is the card number, the winning numbers and then the numbers we have
+    hand = set(row[winners + 1 :])
+    return hand.intersection(row[1 : winners + 1])
 
-def part1(input: List[str]) -> None:
+
+@run_cached
+def get_matches(input: Input) -> List[int]:
+    # The number of winning numbers we have on every card, for both parts
+    integers, winners = input
+    return [len(get_winning_hand(row, winners)) for row in integers.rows()]
+
+
+def parse(lines: Iterable[str]) -> Input:
+    rows = list(lines)
+    # "Card 1: 41 48 | ..." has two words before the winning numbers
+    winners = len(rows[0].split("|")[0].split()) - 2 if rows else 0
+    return get_integers(rows), winners
+
+
+def part1(input: Input) -> int:
     result = 0
-    for row in input:
-        winning_hand = get_winning_hand(row)
-        if len(winning_hand) > 0:
-            result += 2 ** (len(winning_hand) - 1)
+    for matches in get_matches(input):
+        if matches > 0:
+            result += 2 ** (matches - 1)
 
-    print(f"Part 1: {result}")
+    return result
 
 
-def part2(input: List[str]) -> None:
-    scratch_boards = {index: 1 for index, _ in enumerate(input)}
+def part2(input: Input) -> int:
+    all_matches = get_matches(input)
+    scratch_boards = {index: 1 for index in range(len(all_matches))}
 
-    for index, row in enumerate(input):
+    for index, matches in enumerate(all_matches):
         multiply = scratch_boards[index]
-        winning_hand = get_winning_hand(row)
 
-        for number in range(index + 1, index + len(winning_hand) + 1):
+        for number in range(index + 1, index + matches + 1):
             scratch_boards[number] += multiply
 
-    result = sum(scratch_boards.values())
-    print(f"Part 2: {result}")
+    return sum(scratch_boards.values())
 
 
-def main(input: List[str]) -> None:
-    part1(input)
-    part2(input)
+def main(lines: List[str]) -> None:
+    input = parse(lines)
+    print(f"Part 1: {part1(input)}")
+    print(f"Part 2: {part2(input)}")
@@ -1,19 +1,21 @@
-from typing import List, Tuple
+from typing import Iterable, List, Tuple
 
 Race = Tuple[
     int,
     int,
 ]
-Input = List[Race]
+Races = List[Race]
+# (races for part 1, single race for part 2)
+Input = Tuple[Races, Race]
 
 
-def parse_input(lines: List[str]) -> Input:
+def parse_races(lines: List[str]) -> Races:
     times = [int(number) for number in lines[0].removeprefix("Time:").split()]
     distance = [int(number) for number in lines[1].removeprefix("Distance:").split()]
     return [(time, distance) for time, distance in zip(times, distance)]
 
 
-def parse_input2(lines: List[str]) -> Race:
+def parse_race(lines: List[str]) -> Race:
     time = int("".join(number for number in lines[0].removeprefix("Time:").split()))
     distance = int(
         "".join(number for number in lines[1].removeprefix("Distance:").split())
@@ -22,6 +24,12 @@ def parse_input2(lines: List[str]) -> Race:
     return (time, distance)
 
 
+def parse(lines: Iterable[str]) -> Input:
+    # Both parsers need the first two lines
+    first_lines = list(lines)[:2]
+    return parse_races(first_lines), parse_race(first_lines)
+
+
 def run_race(time: int, distance: int) -> int:
     winning_times = 0
     for i in range(1, time):
@@ -33,20 +41,21 @@ def run_race(time: int, distance: int) -> int:
     return winning_times
 
 
-def part1(input: Input) -> None:
+def part1(input: Input) -> int:
+    races, _ = input
     result = 1
-    for time, distance in input:
+    for time, distance in races:
         result *= run_race(time, distance)
 
-    print("Part 1:", result)
+    return result
 
 
-def part2(input: Race) -> None:
-    (time, distance) = input
-    result = run_race(time, distance)
-    print("Part 2:", result)
+def part2(input: Input) -> int:
+    _, (time, distance) = input
+    return run_race(time, distance)
 
 
 def main(lines: List[str]) -> None:
-    part1(parse_input(lines))
-    part2(parse_input2(lines))
+    input = parse(lines)
+    print("Part 1:", part1(input))
+    print("Part 2:", part2(input))
@@ -1,5 +1,5 @@
 from functools import cmp_to_key
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, Dict, Iterable, List, Tuple
 
 Hand = Dict[str, int]
 Player = Tuple[Hand, List[str], int]
@@ -16,7 +16,7 @@ def parse_hand(hand: str) -> Hand:
     return hands
 
 
-def parse_input(lines: List[str]) -> Input:
+def parse(lines: Iterable[str]) -> Input:
     input: Input = []
     for line in lines:
         hand, rank = line.strip().split()
@@ -85,17 +85,17 @@ def compare_generator(strengths: List[str]) -> Callable[[Player, Player], int]:
     return compare
 
 
-def part1(input: Input) -> None:
+def part1(input: Input) -> int:
     compare_key = cmp_to_key(compare_generator(card_strengths))
     sorted_hands = sorted(input, key=compare_key)
     result = 0
     for i, hand in enumerate(sorted_hands):
         result += hand[2] * (i + 1)
 
-    print("Part 1:", result)
+    return result
 
 
-def part2(input: Input) -> None:
+def part2(input: Input) -> int:
     def add_jokers(player: Player) -> Player:
         hand, cards, rank = player
         if "J" not in hand:
@@ -103,6 +103,8 @@ def part2(input: Input) -> None:
         jokers = hand["J"]
         if jokers == 5:
             return player
+        # Copy the hand, so the parsed input is left untouched
+        hand = dict(hand)
         del hand["J"]
         max_card = max(hand, key=lambda card: hand[card])
         hand[max_card] += jokers
@@ -115,10 +117,10 @@ def part2(input: Input) -> None:
     for i, hand in enumerate(sorted_players):
         result += hand[2] * (i + 1)
 
-    print("Part 2:", result)
+    return result
 
 
 def main(lines: List[str]) -> None:
-    input = parse_input(lines)
-    part1(input)
-    part2(input)
+    input = parse(lines)
+    print("Part 1:", part1(input))
+    print("Part 2:", part2(input))
@@ -1,5 +1,4 @@
-import re
-from typing import Dict, List, Literal, Tuple
+from typing import Dict, Iterable, List, Literal, Optional, Tuple
 
 Instruction = Literal["L"] | Literal["R"]
 
@@ -10,11 +9,16 @@ Input = Tuple[List[str], Mapping]
 regex = r"(.+) = \((.+), (.+)\)"
 
 
-def parse_input(lines: List[str]) -> Input:
-    instructions = list(lines[0].strip())
+def parse(lines: Iterable[str]) -> Input:
+    import re
+
+    rows = iter(lines)
+    instructions = list(next(rows).strip())
     mapping: Mapping = {}
 
-    for line in lines[2:]:
+    for line in rows:
+        if line.strip() == "":
+            continue
         match = re.match(regex, line.strip())
         assert match is not None
         mapping[match.group(1)] = (match.group(2), match.group(3))
@@ -22,7 +26,7 @@ def parse_input(lines: List[str]) -> Input:
     return (instructions, mapping)
 
 
-def part1(input: Input) -> None:
+def part1(input: Input) -> Optional[int]:
     instructions, mapping = input
     current = "AAA"
     if current not in mapping:
@@ -37,10 +41,10 @@ def part1(input: Input) -> None:
         if instruction_index == len(instructions):
             instruction_index = 0
 
-    print("Part 1:", steps)
+    return steps
 
 
-def part2(input: Input) -> None:
+def part2(input: Input) -> int:
     def gcd(a: int, b: int) -> int:
         while b:
             a, b = b, a % b
@@ -68,10 +72,13 @@ def part2(input: Input) -> None:
         if instruction_index == len(instructions):
             instruction_index = 0
 
-    print("Part 2:", multiply)
+    return multiply
 
 
 def main(lines: List[str]) -> None:
-    input = parse_input(lines)
-    part1(input)
-    part2(input)
+    input = parse(lines)
+    steps = part1(input)
+    # Inputs without AAA, like example 3, have no part 1
+    if steps is not None:
+        print("Part 1:", steps)
+    print("Part 2:", part2(input))
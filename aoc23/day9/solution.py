@@ -1,10 +1,12 @@
-from typing import List
+from typing import Iterable, List
+
+from aoc23.utils import get_integers
 
 Input = List[List[int]]
 
 
-def parse_input(input: List[str]) -> Input:
-    return [[int(number) for number in line.strip().split()] for line in input]
+def parse(input: Iterable[str]) -> Input:
+    return list(get_integers(input).rows())
 
 
 def all_zeroes(row: List[int]) -> bool:
@@ -39,25 +41,25 @@ def get_difference_list(row: List[int], reversed: bool = False) -> Input:
     return result
 
 
-def part1(input: Input) -> None:
+def part1(input: Input) -> int:
     result = 0
     for row in input:
         differences = get_difference_list(row)
         result += extrapolate(differences)
 
-    print("Part 1:", result)
+    return result
 
 
-def part2(input: Input) -> None:
+def part2(input: Input) -> int:
     result = 0
     for row in input:
         differences = get_difference_list(list(reversed(row)), True)
         result += extrapolate(differences, True)
 
-    print("Part 2:", result)
+    return result
 
 
 def main(lines: List[str]) -> None:
-    input = parse_input(lines)
-    part1(input)
-    part2(input)
+    input = parse(lines)
+    print("Part 1:", part1(input))
+    print("Part 2:", part2(input))
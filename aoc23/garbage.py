@@ -0,0 +1,72 @@
+import gc
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from aoc23.utils import count, count_max, counting
+
+
+def parse_thresholds(thresholds: str) -> Tuple[int, ...]:
+    # i.e. "50000,20,20", the thresholds of generation 0, 1 and 2 as in
+    # gc.set_threshold, trailing ones can be left out
+    values = tuple(int(value) for value in thresholds.split(","))
+    if not 1 <= len(values) <= 3:
+        raise ValueError("Expected 1 to 3 thresholds")
+    return values
+
+
+@contextmanager
+def gc_settings(
+    disable: bool = False, thresholds: Optional[Tuple[int, ...]] = None
+) -> Iterator[None]:
+    # Collect with other thresholds, or not at all, until the block is done
+    was_enabled = gc.isenabled()
+    previous = gc.get_threshold()
+    if thresholds is not None:
+        gc.set_threshold(*thresholds)
+    if disable:
+        gc.disable()
+    try:
+        yield
+    finally:
+        gc.set_threshold(*previous)
+        if was_enabled:
+            gc.enable()
+
+
+@contextmanager
+def frozen() -> Iterator[None]:
+    # Everything allocated so far, such as the parsed input, is moved to the
+    # permanent generation, so collections during the block do not traverse it
+    gc.freeze()
+    try:
+        yield
+    finally:
+        gc.unfreeze()
+
+
+@contextmanager
+def gc_counted(stage: str) -> Iterator[None]:
+    # Counts the collections of each generation during the block and the time they
+    # paused it, for --stats. Nothing is registered unless counters are enabled
+    if not counting():
+        yield
+        return
+
+    start = 0.0
+
+    def callback(phase: str, info: Dict[str, Any]) -> None:
+        nonlocal start
+        if phase == "start":
+            start = time.perf_counter()
+            return
+        pause = int((time.perf_counter() - start) * 1_000_000)
+        count(f"gc {stage} collections gen{info['generation']}")
+        count(f"gc {stage} pause us", pause)
+        count_max(f"gc {stage} max pause us", pause)
+
+    gc.callbacks.append(callback)
+    try:
+        yield
+    finally:
+        gc.callbacks.remove(callback)
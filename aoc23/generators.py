@@ -0,0 +1,418 @@
+import argparse
+import random
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+
+# (size, seeded random) -> lines of a valid input
+Generator = Callable[[int, random.Random], List[str]]
+
+digit_words = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
+
+def name(index: int, width: int) -> str:
+    # Base 26 name of an index, padded with a's to the width
+    letters: List[str] = []
+    while index > 0 or len(letters) < width:
+        index, letter = divmod(index, 26)
+        letters.append(chr(ord("a") + letter))
+    return "".join(reversed(letters))
+
+
+def random_grid(size: int, rng: random.Random, weights: Dict[str, float]) -> List[str]:
+    characters = list(weights)
+    character_weights = list(weights.values())
+    return [
+        "".join(rng.choices(characters, character_weights, k=size)) for _ in range(size)
+    ]
+
+
+def day1(size: int, rng: random.Random) -> List[str]:
+    # size lines of letters, digits and spelled out digits
+    lines: List[str] = []
+    for _ in range(size):
+        tokens: List[str] = [str(rng.randint(1, 9))]
+        for _ in range(rng.randint(2, 10)):
+            kind = rng.random()
+            if kind < 0.2:
+                tokens.append(str(rng.randint(1, 9)))
+            elif kind < 0.5:
+                tokens.append(rng.choice(digit_words))
+            else:
+                tokens.append(
+                    "".join(
+                        rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(1, 4))
+                    )
+                )
+        rng.shuffle(tokens)
+        lines.append("".join(tokens))
+    return lines
+
+
+def day2(size: int, rng: random.Random) -> List[str]:
+    # size games
+    lines: List[str] = []
+    for game in range(1, size + 1):
+        draws: List[str] = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            draws.append(", ".join(f"{rng.randint(1, 20)} {color}" for color in colors))
+        lines.append(f"Game {game}: {'; '.join(draws)}")
+    return lines
+
+
+def day3(size: int, rng: random.Random) -> List[str]:
+    # size x size schematic
+    lines: List[str] = []
+    for _ in range(size):
+        row: List[str] = []
+        while len(row) < size:
+            kind = rng.random()
+            if kind < 0.1:
+                row.extend(str(rng.randint(1, 999)))
+            elif kind < 0.14:
+                row.append(rng.choice("*#+$/@%=&-"))
+            row.append(".")
+        lines.append("".join(row[:size]))
+    return lines
+
+
+def day4(size: int, rng: random.Random) -> List[str]:
+    # size cards, never winning copies of cards past the last one. Few cards match
+    # more than one number, so the number of copies does not grow exponentially
+    lines: List[str] = []
+    for card in range(1, size + 1):
+        winning = rng.sample(range(1, 100), 10)
+        matches = min(int(rng.expovariate(1)), 10, size - card)
+        losing = [number for number in range(1, 100) if number not in winning]
+        numbers = rng.sample(winning, matches) + rng.sample(losing, 25 - matches)
+        rng.shuffle(numbers)
+        lines.append(
+            f"Card {card:>3}: {' '.join(f'{number:>2}' for number in winning)} | "
+            f"{' '.join(f'{number:>2}' for number in numbers)}"
+        )
+    return lines
+
+
+def day5(size: int, rng: random.Random) -> List[str]:
+    # size seeds, and a map line per 100 seeds in each of the maps
+    limit = 1 << 32
+    seeds: List[int] = []
+    for _ in range(max(1, size // 2)):
+        length = rng.randint(1, 1 << 24)
+        seeds.extend((rng.randrange(limit - length), length))
+    lines = [f"seeds: {' '.join(str(seed) for seed in seeds)}"]
+
+    categories = [
+        "seed",
+        "soil",
+        "fertilizer",
+        "water",
+        "light",
+        "temperature",
+        "humidity",
+        "location",
+    ]
+    map_lines = max(1, size // 100)
+    for source, destination in zip(categories, categories[1:]):
+        lines.extend(["", f"{source}-to-{destination} map:"])
+        # Pairs of sorted points are non overlapping source ranges
+        points = sorted(rng.sample(range(limit), 2 * map_lines))
+        for start, stop in zip(points[::2], points[1::2]):
+            length = stop - start
+            lines.append(f"{rng.randrange(limit - length)} {start} {length}")
+    return lines
+
+
+def day7(size: int, rng: random.Random) -> List[str]:
+    # size hands
+    return [
+        f"{''.join(rng.choices('23456789TJQKA', k=5))} {rng.randint(1, 1000)}"
+        for _ in range(size)
+    ]
+
+
+def day9(size: int, rng: random.Random) -> List[str]:
+    # size polynomial sequences of 21 values
+    lines: List[str] = []
+    for _ in range(size):
+        coefficients = [rng.randint(-5, 5) for _ in range(rng.randint(1, 6))]
+        values = (
+            sum(
+                coefficient * x**power
+                for power, coefficient in enumerate(coefficients)
+            )
+            for x in range(21)
+        )
+        lines.append(" ".join(str(value) for value in values))
+    return lines
+
+
+def day11(size: int, rng: random.Random) -> List[str]:
+    # size x size image, with a tenth of the rows and columns empty
+    empty_rows = set(rng.sample(range(size), size // 10))
+    empty_columns = set(rng.sample(range(size), size // 10))
+    return [
+        "".join(
+            "#"
+            if y not in empty_rows and x not in empty_columns and rng.random() < 0.025
+            else "."
+            for x in range(size)
+        )
+        for y in range(size)
+    ]
+
+
+def day12(size: int, rng: random.Random) -> List[str]:
+    # size rows, made from a random arrangement with some springs unknown
+    lines: List[str] = []
+    for _ in range(size):
+        springs = rng.choices("#.", k=rng.randint(5, 20))
+        springs[rng.randrange(len(springs))] = "#"
+        sizes = [len(group) for group in "".join(springs).split(".") if group]
+        conditions = "".join(
+            "?" if rng.random() < 0.5 else spring for spring in springs
+        )
+        lines.append(f"{conditions} {','.join(str(size) for size in sizes)}")
+    return lines
+
+
+def day13(size: int, rng: random.Random) -> List[str]:
+    # size patterns, each with a reflection
+    lines: List[str] = []
+    for pattern in range(size):
+        height = rng.randint(5, 17)
+        width = rng.randint(5, 17)
+        reflection = rng.randint(1, height - 1)
+        rows: List[str] = []
+        for y in range(height):
+            mirrored = 2 * reflection - 1 - y
+            if reflection <= y and mirrored >= 0:
+                rows.append(rows[mirrored])
+            else:
+                rows.append("".join(rng.choices("#.", k=width)))
+        if rng.random() < 0.5:
+            rows = ["".join(column) for column in zip(*rows)]
+        if pattern > 0:
+            lines.append("")
+        lines.extend(rows)
+    return lines
+
+
+def day14(size: int, rng: random.Random) -> List[str]:
+    # size x size platform
+    return random_grid(size, rng, {"O": 0.2, "#": 0.15, ".": 0.65})
+
+
+def day15(size: int, rng: random.Random) -> List[str]:
+    # size steps on a single line
+    labels = [
+        "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(2, 6)))
+        for _ in range(max(1, size // 4))
+    ]
+    steps = [
+        f"{rng.choice(labels)}={rng.randint(1, 9)}"
+        if rng.random() < 0.6
+        else f"{rng.choice(labels)}-"
+        for _ in range(size)
+    ]
+    return [",".join(steps)]
+
+
+def day16(size: int, rng: random.Random) -> List[str]:
+    # size x size contraption
+    return random_grid(
+        size, rng, {".": 0.9, "/": 0.025, "\\": 0.025, "|": 0.025, "-": 0.025}
+    )
+
+
+def day17(size: int, rng: random.Random) -> List[str]:
+    # size x size city
+    return random_grid(size, rng, {str(digit): 1 for digit in range(1, 10)})
+
+
+def skyline(columns: int, rng: random.Random, steps: int) -> List[Tuple[str, int]]:
+    # A closed loop going right along the top of columns of random heights, then
+    # down and back left along the bottom
+    instructions: List[Tuple[str, int]] = []
+    height = 0
+    for _ in range(columns):
+        next_height = rng.randint(1, steps)
+        while next_height == height:
+            next_height = rng.randint(1, steps)
+        instructions.append(
+            ("U" if next_height > height else "D", abs(next_height - height))
+        )
+        instructions.append(("R", rng.randint(1, steps)))
+        height = next_height
+    instructions.append(("D", height))
+    instructions.append(("L", sum(steps for direction, steps in instructions[1::2])))
+    return instructions
+
+
+def day18(size: int, rng: random.Random) -> List[str]:
+    # About size instructions
+    columns = max(1, (size - 2) // 2)
+    instructions = skyline(columns, rng, 10)
+    hexes = [
+        f"{steps:05x}{'RDLU'.index(direction)}"
+        for direction, steps in skyline(columns, rng, 1 << 19)
+    ]
+    return [
+        f"{direction} {steps} (#{hex})"
+        for (direction, steps), hex in zip(instructions, hexes)
+    ]
+
+
+def day19(size: int, rng: random.Random) -> List[str]:
+    # size workflows in a tree, so every workflow is reached by a single path, and
+    # size parts
+    names = ["in"] + [name(index, 3) for index in range(1, size)]
+    children: Dict[int, List[int]] = {}
+    for index in range(1, size):
+        children.setdefault((index - 1) // 3, []).append(index)
+
+    lines: List[str] = []
+    for index, workflow in enumerate(names):
+        targets = [names[child] for child in children.get(index, [])]
+        while len(targets) < 2 or rng.random() < 0.3:
+            targets.append(rng.choice("AR"))
+        rng.shuffle(targets)
+        rules = [
+            f"{rng.choice('xmas')}{rng.choice('<>')}{rng.randint(1, 4000)}:{target}"
+            for target in targets[:-1]
+        ]
+        lines.append(f"{workflow}{{{','.join(rules + targets[-1:])}}}")
+
+    lines.append("")
+    for _ in range(size):
+        ratings = ",".join(f"{rating}={rng.randint(1, 4000)}" for rating in "xmas")
+        lines.append(f"{{{ratings}}}")
+    return lines
+
+
+def day22(size: int, rng: random.Random) -> List[str]:
+    # size bricks stacked in a 10 x 10 area
+    top = [[0] * 10 for _ in range(10)]
+    lines: List[str] = []
+    for _ in range(size):
+        x, y = rng.randrange(10), rng.randrange(10)
+        length = rng.randint(0, 3)
+        axis = rng.randrange(3)
+        x2 = min(x + length, 9) if axis == 0 else x
+        y2 = min(y + length, 9) if axis == 1 else y
+        cells = [(cx, cy) for cx in range(x, x2 + 1) for cy in range(y, y2 + 1)]
+        z = max(top[cx][cy] for cx, cy in cells) + 1 + rng.randint(0, 2)
+        z2 = z + length if axis == 2 else z
+        for cx, cy in cells:
+            top[cx][cy] = z2
+        lines.append(f"{x},{y},{z}~{x2},{y2},{z2}")
+    rng.shuffle(lines)
+    return lines
+
+
+def day24(size: int, rng: random.Random) -> List[str]:
+    # size hailstones around the test area
+    lines: List[str] = []
+    for _ in range(size):
+        position = [rng.randint(150_000_000_000_000, 450_000_000_000_000)]
+        position.extend(
+            rng.randint(100_000_000_000_000, 500_000_000_000_000) for _ in "yz"
+        )
+        velocity = [rng.choice([-1, 1]) * rng.randint(1, 500) for _ in "xyz"]
+        lines.append(
+            f"{', '.join(str(value) for value in position)} @ "
+            f"{', '.join(str(value) for value in velocity)}"
+        )
+    return lines
+
+
+def day25(size: int, rng: random.Random) -> List[str]:
+    # size components in two clusters, connected by three wires
+    width = max(3, len(name(size, 0)))
+    names = [name(index, width) for index in range(size)]
+    half = max(5, size // 2)
+    clusters = [list(range(half)), list(range(half, max(size, 2 * half)))]
+    names.extend(name(index, width) for index in range(size, max(size, 2 * half)))
+
+    connections: Dict[int, List[int]] = {}
+    for cluster in clusters:
+        for position, component in enumerate(cluster):
+            # A ring, and random wires within the cluster
+            others = [cluster[(position + 1) % len(cluster)]]
+            others.extend(
+                other
+                for other in rng.sample(cluster, 2)
+                if other != component and other not in others
+            )
+            connections.setdefault(component, []).extend(others)
+    for first, second in zip(rng.sample(clusters[0], 3), rng.sample(clusters[1], 3)):
+        connections[first].append(second)
+
+    return [
+        f"{names[component]}: {' '.join(names[other] for other in others)}"
+        for component, others in connections.items()
+    ]
+
+
+# Day -> (generator, a size about the one of the problem input). Days 6, 8, 10, 20, 21
+# and 23 rely on structure of the problem input, such as cycles, a single loop or
+# the geometry of the garden, that random inputs do not have
+GENERATORS: Dict[int, Tuple[Generator, int]] = {
+    1: (day1, 1000),
+    2: (day2, 100),
+    3: (day3, 140),
+    4: (day4, 200),
+    5: (day5, 20),
+    7: (day7, 1000),
+    9: (day9, 200),
+    11: (day11, 140),
+    12: (day12, 1000),
+    13: (day13, 100),
+    14: (day14, 100),
+    15: (day15, 4000),
+    16: (day16, 110),
+    17: (day17, 140),
+    18: (day18, 670),
+    19: (day19, 550),
+    22: (day22, 1250),
+    24: (day24, 300),
+    25: (day25, 1500),
+}
+
+
+def generate(day: int, size: Optional[int] = None, seed: int = 0) -> List[str]:
+    if day not in GENERATORS:
+        raise ValueError(f"Day {day} has no input generator")
+    generator, default_size = GENERATORS[day]
+    # Seeded by all arguments, so a size is not a prefix of a larger one
+    rng = random.Random(f"{day}-{size}-{seed}")
+    return generator(default_size if size is None else size, rng)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m aoc23.generators")
+    parser.add_argument(
+        "--day",
+        type=int,
+        required=True,
+        help="The day to generate an input for",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        help="The size of the input, defaults to about the size of the problem input",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="The seed of the generator",
+    )
+    args = parser.parse_args()
+
+    for line in generate(args.day, args.size, args.seed):
+        sys.stdout.write(f"{line}\n")
+
+
+if __name__ == "__main__":
+    main()
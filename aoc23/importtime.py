@@ -0,0 +1,81 @@
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# (module, cumulative import time in microseconds)
+ImportTime = Tuple[str, int]
+
+
+def get_import_times(args: List[str]) -> List[ImportTime]:
+    # `-X importtime` writes one line per import to stderr, i.e.
+    # "import time:       121 |        121 | aoc23"
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{process.stderr}")
+
+    import_times: List[ImportTime] = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        # Nested imports are indented, and already part of the cumulative time of
+        # the top level import
+        if module.startswith("  ") or not cumulative.strip().isdigit():
+            continue
+        import_times.append((module.strip(), int(cumulative)))
+    return import_times
+
+
+def get_cli_import_times(cli_args: List[str]) -> List[ImportTime]:
+    # Only count what the CLI imports on top of what the interpreter imports
+    # anyway, so the site packages of the environment do not count
+    interpreter: Dict[str, int] = dict(get_import_times(["-c", "pass"]))
+    return [
+        (module, cumulative)
+        for module, cumulative in get_import_times(["-m", "aoc23", *cli_args])
+        if module not in interpreter
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m aoc23.importtime")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=20.0,
+        help="The maximum import time of the CLI in milliseconds",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="The number of cold starts, the fastest one is compared to the budget",
+    )
+    parser.add_argument(
+        "cli_args",
+        nargs="*",
+        default=["--day", "1"],
+        help="The arguments passed to the CLI, defaults to --day 1",
+    )
+    args = parser.parse_args()
+
+    runs = [get_cli_import_times(args.cli_args) for _ in range(args.runs)]
+    fastest = min(runs, key=lambda run: sum(cumulative for _, cumulative in run))
+    total = sum(cumulative for _, cumulative in fastest) / 1000
+
+    for module, cumulative in sorted(fastest, key=lambda item: -item[1]):
+        print(f"{cumulative / 1000:>9.3f}ms {module}")
+    print(f"Total: {total:.3f}ms (budget {args.budget:.3f}ms)")
+
+    if total > args.budget:
+        print("Import time is over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
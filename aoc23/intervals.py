@@ -0,0 +1,191 @@
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Intervals are half-open, (start, stop) covers start up to but not including stop,
+# like range
+Interval = Tuple[int, int]
+
+
+class IntervalSet:
+    # Sorted, disjoint intervals, where touching intervals are coalesced. Starts and
+    # stops are kept in separate lists, so they can be searched with bisect
+    def __init__(self, intervals: Iterable[Interval] = ()) -> None:
+        self.starts: List[int] = []
+        self.stops: List[int] = []
+        for start, stop in intervals:
+            self.add(start, stop)
+
+    def add(self, start: int, stop: int) -> None:
+        if start >= stop:
+            return
+        # The intervals that overlap or touch the new one are merged into it
+        left = bisect_left(self.stops, start)
+        right = bisect_right(self.starts, stop)
+        if left < right:
+            start = min(start, self.starts[left])
+            stop = max(stop, self.stops[right - 1])
+        self.starts[left:right] = [start]
+        self.stops[left:right] = [stop]
+
+    def __contains__(self, value: int) -> bool:
+        index = bisect_right(self.starts, value) - 1
+        return index >= 0 and value < self.stops[index]
+
+    def __iter__(self) -> Iterator[Interval]:
+        return zip(self.starts, self.stops)
+
+    def __len__(self) -> int:
+        # The number of intervals, not of values
+        return len(self.starts)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return self.starts == other.starts and self.stops == other.stops
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)})"
+
+    def size(self) -> int:
+        # The number of values in the set
+        return sum(self.stops) - sum(self.starts)
+
+    def min(self) -> int:
+        return self.starts[0]
+
+    def split(self, value: int) -> Tuple["IntervalSet", "IntervalSet"]:
+        # (values below value, values from value up)
+        index = bisect_right(self.starts, value)
+        below, above = IntervalSet(), IntervalSet()
+        below.starts, below.stops = self.starts[:index], self.stops[:index]
+        above.starts, above.stops = self.starts[index:], self.stops[index:]
+        # The interval containing value is split in two
+        if index > 0 and below.stops[-1] > value:
+            above.starts.insert(0, value)
+            above.stops.insert(0, below.stops[-1])
+            below.stops[-1] = value
+            if below.starts[-1] == value:
+                below.starts.pop()
+                below.stops.pop()
+        return below, above
+
+    def intersection(self, other: "IntervalSet") -> "IntervalSet":
+        # Both sets are sorted, so a single merge finds every overlap
+        result = IntervalSet()
+        i = j = 0
+        while i < len(self.starts) and j < len(other.starts):
+            start = max(self.starts[i], other.starts[j])
+            stop = min(self.stops[i], other.stops[j])
+            if start < stop:
+                result.starts.append(start)
+                result.stops.append(stop)
+            # Move past the interval that ends first
+            if self.stops[i] < other.stops[j]:
+                i += 1
+            else:
+                j += 1
+        return result
+
+    def translate(self, offset: int) -> "IntervalSet":
+        result = IntervalSet()
+        result.starts = [start + offset for start in self.starts]
+        result.stops = [stop + offset for stop in self.stops]
+        return result
+
+
+class IntervalMap:
+    # Disjoint, sorted intervals with an offset that is added to every value in
+    # them. Values outside of every interval map to themselves
+    def __init__(self, entries: Iterable[Tuple[int, int, int]] = ()) -> None:
+        self.starts: List[int] = []
+        self.stops: List[int] = []
+        self.offsets: List[int] = []
+        for start, stop, offset in entries:
+            self.add(start, stop, offset)
+
+    def add(self, start: int, stop: int, offset: int) -> None:
+        if start >= stop:
+            return
+        index = bisect_right(self.starts, start)
+        if (index > 0 and self.stops[index - 1] > start) or (
+            index < len(self.starts) and self.starts[index] < stop
+        ):
+            raise ValueError(f"Interval ({start}, {stop}) overlaps another interval")
+        self.starts.insert(index, start)
+        self.stops.insert(index, stop)
+        self.offsets.insert(index, offset)
+
+    def __getitem__(self, value: int) -> int:
+        index = bisect_right(self.starts, value) - 1
+        if index >= 0 and value < self.stops[index]:
+            return value + self.offsets[index]
+        return value
+
+    def __repr__(self) -> str:
+        entries = list(zip(self.starts, self.stops, self.offsets))
+        return f"IntervalMap({entries})"
+
+    def map(self, intervals: IntervalSet) -> IntervalSet:
+        # Every interval is split at the boundaries of the entries it overlaps, and
+        # every piece is translated by the offset of its entry, if any
+        result = IntervalSet()
+        starts, stops, offsets = self.starts, self.stops, self.offsets
+        for start, stop in intervals:
+            # The first entry that ends after start
+            index = bisect_right(starts, start) - 1
+            if index < 0 or stops[index] <= start:
+                index += 1
+            current = start
+            while current < stop:
+                if index < len(starts) and starts[index] <= current:
+                    end = min(stop, stops[index])
+                    offset = offsets[index]
+                    result.add(current + offset, end + offset)
+                    index += 1
+                else:
+                    end = stop if index == len(starts) else min(stop, starts[index])
+                    result.add(current, end)
+                current = end
+        return result
+
+
+class Box(Tuple[Interval, ...]):
+    # An N-dimensional box, an interval per axis
+
+    def volume(self) -> int:
+        volume = 1
+        for start, stop in self:
+            volume *= stop - start
+        return volume
+
+    def intersects(self, other: "Box") -> bool:
+        return all(
+            max(start, other_start) < min(stop, other_stop)
+            for (start, stop), (other_start, other_stop) in zip(self, other)
+        )
+
+    def intersection(self, other: "Box") -> Optional["Box"]:
+        intervals = [
+            (max(start, other_start), min(stop, other_stop))
+            for (start, stop), (other_start, other_stop) in zip(self, other)
+        ]
+        if any(start >= stop for start, stop in intervals):
+            return None
+        return Box(intervals)
+
+    def translate(self, axis: int, offset: int) -> "Box":
+        start, stop = self[axis]
+        return self.replace(axis, (start + offset, stop + offset))
+
+    def replace(self, axis: int, interval: Interval) -> "Box":
+        return Box(self[:axis] + (interval,) + self[axis + 1 :])
+
+    def split(self, axis: int, value: int) -> Tuple[Optional["Box"], Optional["Box"]]:
+        # (the part below value along axis, the part from value up), None for a part
+        # that is empty
+        start, stop = self[axis]
+        if value <= start:
+            return None, self
+        if value >= stop:
+            return self, None
+        return self.replace(axis, (start, value)), self.replace(axis, (value, stop))
@@ -0,0 +1,186 @@
+import sys
+import threading
+import tracemalloc
+from typing import Any, Callable, Iterable, List, Optional
+
+from aoc23.registry import get_parts, load_solver
+from aoc23.utils import new_run
+
+MEBIBYTE = 1024 * 1024
+# The address space a memory limit leaves above what the interpreter already uses,
+# at the least
+MIN_HEADROOM = 32 * MEBIBYTE
+# Allocated when the memory limit is set and freed when it is exceeded, so there is
+# memory left to report it
+RESERVE_SIZE = 8 * MEBIBYTE
+reserve: Optional[bytearray] = None
+
+
+def set_memory_limit(megabytes: float) -> None:
+    # Limits the address space of this process and of the processes it starts, so a
+    # runaway day raises MemoryError instead of taking the machine down
+    import resource
+
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = int(megabytes * MEBIBYTE)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    global reserve
+    reserve = bytearray(RESERVE_SIZE)
+
+
+def out_of_memory(exception: BaseException) -> bool:
+    # A MemoryError, or a SystemError raised because running out of memory while
+    # raising one lost it. Any other SystemError is a real error
+    if isinstance(exception, MemoryError):
+        return True
+    if not isinstance(exception, SystemError):
+        return False
+    if isinstance(exception.__cause__ or exception.__context__, MemoryError):
+        return True
+    # The MemoryError can be lost altogether, then there is still not enough memory
+    # for a second reserve
+    try:
+        bytearray(RESERVE_SIZE)
+    except MemoryError:
+        return True
+    return False
+
+
+def release_reserve() -> None:
+    global reserve
+    reserve = None
+
+
+def address_space() -> int:
+    # The size of the address space of this process, which the memory limit
+    # applies to, or 0 where it cannot be read
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith("VmSize:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def reset_peak_rss() -> bool:
+    # Linux resets the peak resident set size when writing 5 to clear_refs
+    try:
+        with open("/proc/self/clear_refs", "w") as file:
+            file.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss() -> int:
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # Peak of the whole process, which cannot be reset
+    import resource
+
+    maximum = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kibibytes, macOS bytes
+    return maximum if sys.platform == "darwin" else maximum * 1024
+
+
+def format_size(size: float) -> str:
+    return f"{size / MEBIBYTE:.2f}MiB"
+
+
+# How often the traced memory is sampled while a stage runs, in seconds, and how much
+# it has to grow past the largest sample before the allocation sites are taken again
+SAMPLE_INTERVAL = 0.005
+SAMPLE_GROWTH = 1.05
+# Leave out the allocations of the snapshots and of the sampler themselves
+IGNORE = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, threading.__file__),
+]
+
+
+class PeakSampler(threading.Thread):
+    # Takes the top allocation sites whenever the traced memory grew past the largest
+    # sample so far, so the sites are those of the peak, including short lived ones,
+    # and not only those still allocated when the stage is done
+    def __init__(self, top: int) -> None:
+        super().__init__(daemon=True)
+        self.top = top
+        self.stopped = threading.Event()
+        self.peak = 0
+        # The traced memory when the sites were taken
+        self.size = 0
+        self.sites: List[tracemalloc.Statistic] = []
+
+    def run(self) -> None:
+        while not self.stopped.wait(SAMPLE_INTERVAL):
+            self.sample()
+
+    def sample(self) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak = max(self.peak, peak)
+        if current > self.size * SAMPLE_GROWTH:
+            snapshot = tracemalloc.take_snapshot().filter_traces(IGNORE)
+            self.size = current
+            self.sites = snapshot.statistics("lineno")[: self.top]
+            del snapshot
+            # The snapshot is traced too, so it is left out of the peak
+            tracemalloc.reset_peak()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+        # The end of the stage, for stages shorter than the interval
+        self.sample()
+
+
+def measure_day(day: int, lines: Iterable[str], top: int = 10) -> List[Any]:
+    module = load_solver(day)
+
+    def run_stage(name: str, function: Callable[[Any], Any], argument: Any) -> Any:
+        # Each stage is measured as if it ran on its own, not on the results part 1
+        # shared with run_cached
+        new_run()
+        reset_peak_rss()
+        # Only allocations made from here on are traced
+        tracemalloc.start()
+        sampler = PeakSampler(top)
+        sampler.start()
+        try:
+            result = function(argument)
+        finally:
+            sampler.stop()
+            overhead = tracemalloc.get_tracemalloc_memory()
+            tracemalloc.stop()
+
+        print(f"== Day {day} {name}")
+        print(
+            f"Peak RSS: {format_size(peak_rss())}, "
+            f"including {format_size(overhead)} used by tracemalloc"
+        )
+        print(f"Peak traced: {format_size(sampler.peak)}")
+        print(f"Top allocation sites at {format_size(sampler.size)} traced:")
+        for statistic in sampler.sites:
+            frame = statistic.traceback[0]
+            print(
+                f"  {format_size(statistic.size):>12} "
+                f"{statistic.count:>9} blocks  {frame.filename}:{frame.lineno}"
+            )
+        print()
+        return result
+
+    if not reset_peak_rss():
+        print("Peak RSS cannot be reset, so it is the peak of the whole process")
+    parsed = run_stage("parse", module.parse, lines)
+    return [
+        run_stage(f"part{part}", getattr(module, f"part{part}"), parsed)
+        for part in get_parts(module)
+    ]
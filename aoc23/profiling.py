@@ -0,0 +1,118 @@
+import cProfile
+import os
+import pstats
+import sys
+import time
+from types import FrameType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from aoc23.registry import get_parts, load_solver
+from aoc23.utils import new_run
+
+# Stack of frame labels, from the outermost call -> time spent in the innermost one
+Stacks = Dict[Tuple[str, ...], float]
+
+
+def frame_label(frame: FrameType, event: str, arg: Any) -> str:
+    if event.startswith("c_"):
+        # arg is the builtin being called
+        module = getattr(arg, "__module__", None) or "builtins"
+        return f"{module}.{getattr(arg, '__qualname__', repr(arg))}"
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+
+
+def trace_stacks(function: Callable[[Any], Any], argument: Any) -> Tuple[Any, Stacks]:
+    # Deterministic tracer recording the self time of every distinct call stack,
+    # the input of flamegraph tools
+    stacks: Stacks = {}
+    # (label, start, time spent in children)
+    stack: List[Tuple[str, float, float]] = []
+    labels: List[str] = []
+
+    def profile(frame: FrameType, event: str, arg: Any) -> None:
+        now = time.perf_counter()
+        if event == "call" or event == "c_call":
+            label = frame_label(frame, event, arg)
+            stack.append((label, now, 0.0))
+            labels.append(label)
+        elif event in ("return", "c_return", "c_exception") and stack:
+            _, start, children = stack.pop()
+            elapsed = now - start
+            key = tuple(labels)
+            stacks[key] = stacks.get(key, 0.0) + elapsed - children
+            labels.pop()
+            if stack:
+                label, parent_start, parent_children = stack[-1]
+                stack[-1] = (label, parent_start, parent_children + elapsed)
+
+    sys.setprofile(profile)
+    try:
+        result = function(argument)
+    finally:
+        sys.setprofile(None)
+    return result, stacks
+
+
+def write_collapsed(path: str, stacks: Dict[str, Stacks]) -> None:
+    # One line per stack: "stage;outer;...;inner <microseconds>"
+    with open(path, "w") as file:
+        for stage, stage_stacks in stacks.items():
+            for stack, seconds in stage_stacks.items():
+                microseconds = round(seconds * 1_000_000)
+                if microseconds > 0:
+                    file.write(f"{';'.join((stage, *stack))} {microseconds}\n")
+
+
+def print_top(profile: cProfile.Profile, top: int) -> None:
+    stats = pstats.Stats(profile, stream=sys.stdout).strip_dirs()
+    print("By cumulative time:")
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    print("By self time:")
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+
+
+def profile_day(
+    day: int,
+    lines: Iterable[str],
+    directory: str,
+    top: int = 15,
+    collapsed_path: Optional[str] = None,
+) -> List[Any]:
+    module = load_solver(day)
+    os.makedirs(directory, exist_ok=True)
+    stacks: Dict[str, Stacks] = {}
+
+    def run_stage(name: str, function: Callable[[Any], Any], argument: Any) -> Any:
+        # Each stage is profiled as if it ran on its own, not on the results part 1
+        # shared with run_cached
+        new_run()
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        result = profile.runcall(function, argument)
+        wall = time.perf_counter() - start
+
+        path = f"{directory}/day{day}-{name}.pstats"
+        profile.dump_stats(path)
+        print(f"== Day {day} {name} ({wall:.3f}s) -> {path}")
+        print_top(profile, top)
+
+        if collapsed_path is not None:
+            # Stages do not mutate their input, so they can be traced on a second run
+            new_run()
+            _, stacks[name] = trace_stacks(function, argument)
+        return result
+
+    # Keep the lines around, so they can be parsed again by the tracer
+    parsed = run_stage("parse", module.parse, list(lines))
+    answers = [
+        run_stage(f"part{part}", getattr(module, f"part{part}"), parsed)
+        for part in get_parts(module)
+    ]
+
+    if collapsed_path is not None:
+        write_collapsed(collapsed_path, stacks)
+        print(f"Collapsed stacks -> {collapsed_path}")
+
+    return answers
@@ -0,0 +1,47 @@
+import os
+from types import ModuleType
+from typing import Dict, List
+
+from aoc23.utils import directory
+
+# Day -> module implementing parse, part1 and part2. Modules are only imported when
+# the day is actually solved
+SOLVERS: Dict[int, str] = {day: f"aoc23.day{day}.solution" for day in range(1, 26)}
+
+DAYS = sorted(SOLVERS)
+
+
+def load_solver(day: int) -> ModuleType:
+    if day not in SOLVERS:
+        raise ValueError(f"Day {day} is not a valid day")
+    # Unlike importlib.import_module, __import__ goes through the same machinery as
+    # an import statement, so the solution shows up in `-X importtime`
+    return __import__(SOLVERS[day], fromlist=["parse"])
+
+
+def solver_path(day: int) -> str:
+    return f"{directory}/day{day}/solution.py"
+
+
+def solver_version(day: int) -> str:
+    # Hash of the solution source, and of the sources of the aoc23 modules it
+    # imports, so shared code changing also changes the version
+    import hashlib
+    import re
+
+    path = solver_path(day)
+    with open(path, "rb") as file:
+        source = file.read()
+    digest = hashlib.sha256(source)
+    modules = re.findall(rb"^\s*(?:from|import) aoc23\.(\w+)", source, re.MULTILINE)
+    for module in sorted(set(modules)):
+        module_path = f"{directory}/{module.decode()}.py"
+        if os.path.exists(module_path):
+            with open(module_path, "rb") as file:
+                digest.update(file.read())
+    return digest.hexdigest()
+
+
+def get_parts(module: ModuleType) -> List[int]:
+    # Not every day has a second part implemented
+    return [part for part in (1, 2) if hasattr(module, f"part{part}")]
@@ -0,0 +1,322 @@
+import io
+import time
+from contextlib import nullcontext, redirect_stdout
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from aoc23.garbage import frozen, gc_counted, gc_settings
+from aoc23.registry import DAYS, get_parts, load_solver, solver_version
+from aoc23.utils import (
+    Span,
+    cache_directory,
+    cached_parse,
+    get_file_input,
+    input_path,
+    iter_file_input,
+    map_file_input,
+    new_run,
+)
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from mmap import mmap
+
+# Wall times (in seconds) used for scheduling before any run has been recorded
+default_estimates: Dict[int, float] = {
+    23: 600.0,
+    22: 125.0,
+    17: 35.0,
+    6: 15.0,
+    25: 15.0,
+    16: 10.0,
+    14: 8.5,
+    12: 7.0,
+    11: 1.0,
+    20: 0.6,
+}
+
+# Answers to the parts a solution implements, in order
+Answers = List[Any]
+# Stage name (parse, part1, part2) -> wall time
+StageTimings = Dict[str, float]
+# (day, output, wall time, error, whether the answers came from the cache)
+DayResult = Tuple[int, str, float, Optional[str], bool]
+
+
+class Options(NamedTuple):
+    example: Optional[int] = None
+    strip: bool = False
+    parallel_parts: bool = False
+    # Look up and store the answers in the answer cache
+    use_cache: bool = True
+    # Recompute the answers even if they are cached
+    refresh: bool = False
+    # Look up and store the parsed input in the parsed input cache
+    parse_cache: bool = False
+    # Stream the lines of the input to the parser, instead of reading them up front
+    stream: bool = False
+    # Memory map the input for solutions with a parse_mapped, instead of reading
+    # its lines
+    mmap: bool = False
+    # Solve this file instead of the problem or example input of the day
+    input_file: Optional[str] = None
+    # Move the parsed input to the permanent generation, so collections during the
+    # parts do not traverse it
+    gc_freeze: bool = False
+    # Run the parts without the cyclic garbage collector
+    gc_disable: bool = False
+    # Run the parts with these thresholds, as in gc.set_threshold
+    gc_thresholds: Optional[Tuple[int, ...]] = None
+
+
+def parse_days(days: str) -> List[int]:
+    # Accepts a comma separated list of days and ranges, i.e. "1-12,17"
+    result: List[int] = []
+    for part in days.split(","):
+        part = part.strip()
+        if part == "":
+            continue
+        if "-" in part:
+            start, end = part.split("-")
+            result.extend(range(int(start), int(end) + 1))
+        else:
+            result.append(int(part))
+
+    for day in result:
+        if day not in DAYS:
+            raise ValueError(f"Day {day} is not a valid day")
+
+    # Remove duplicates, but keep the order
+    return list(dict.fromkeys(result))
+
+
+def timings_file() -> str:
+    return f"{cache_directory()}/timings.json"
+
+
+def load_timings() -> Dict[int, float]:
+    import json
+
+    try:
+        with open(timings_file()) as file:
+            return {int(day): wall for day, wall in json.load(file).items()}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_timings(timings: Dict[int, float]) -> None:
+    import json
+
+    with open(timings_file(), "w") as file:
+        json.dump({str(day): wall for day, wall in sorted(timings.items())}, file)
+
+
+def schedule(days: List[int], timings: Dict[int, float]) -> List[int]:
+    # Longest processing time first, so the slowest days do not end up being
+    # started last and stretch the makespan
+    def estimate(day: int) -> float:
+        return timings.get(day, default_estimates.get(day, 0.0))
+
+    return sorted(days, key=estimate, reverse=True)
+
+
+def run_part(
+    day: int, part: int, parsed: Any, options: Options = Options()
+) -> Tuple[Any, float]:
+    function = getattr(load_solver(day), f"part{part}")
+    settings = gc_settings(options.gc_disable, options.gc_thresholds)
+    start = time.perf_counter()
+    with settings, gc_counted(f"part{part}"), Span(f"part{part}"):
+        answer = function(parsed)
+    return answer, time.perf_counter() - start
+
+
+def solve(
+    day: int,
+    lines: Iterable[str],
+    options: Options = Options(),
+    mapped: Optional[Union["mmap", bytes]] = None,
+) -> Tuple[Answers, StageTimings]:
+    # With mapped, the solution parses the mapped input instead of the lines
+    module = load_solver(day)
+    timings: StageTimings = {}
+    new_run()
+
+    start = time.perf_counter()
+    with gc_counted("parse"), Span("parse"):
+        if mapped is not None:
+            parsed = module.parse_mapped(mapped)
+        elif options.parse_cache:
+            parsed = cached_parse(module.parse, lines, solver_version(day))
+        else:
+            parsed = module.parse(lines)
+    timings["parse"] = time.perf_counter() - start
+
+    parts = get_parts(module)
+    with frozen() if options.gc_freeze else nullcontext():
+        # A parsed input can refer to the map, which cannot be sent to a process
+        if options.parallel_parts and len(parts) > 1 and mapped is None:
+            # The process pool is slow to import, so only import it when it is used
+            from concurrent.futures import ProcessPoolExecutor
+
+            # Parts do not mutate the parsed input, so each one can run in its own
+            # process on a copy of it
+            with ProcessPoolExecutor(max_workers=len(parts)) as executor:
+                futures = [
+                    executor.submit(run_part, day, part, parsed, options)
+                    for part in parts
+                ]
+                results = [future.result() for future in futures]
+        else:
+            results = [run_part(day, part, parsed, options) for part in parts]
+
+    answers: Answers = []
+    for part, (answer, wall) in zip(parts, results):
+        answers.append(answer)
+        timings[f"part{part}"] = wall
+    return answers, timings
+
+
+def options_input(day: int, options: Options) -> str:
+    return options.input_file or input_path(day, options.example)
+
+
+def read_lines(day: int, options: Options) -> Iterable[str]:
+    if options.stream:
+        return iter_file_input(options_input(day, options), options.strip)
+    return get_file_input(options_input(day, options), options.strip)
+
+
+def solve_input(day: int, options: Options) -> Tuple[Answers, StageTimings]:
+    # Solutions without a parse_mapped get the lines, even with mmap
+    if options.mmap and hasattr(load_solver(day), "parse_mapped"):
+        with map_file_input(options_input(day, options)) as mapped:
+            return solve(day, (), options, mapped)
+    return solve(day, read_lines(day, options), options)
+
+
+def solve_cached(day: int, options: Options) -> Tuple[Answers, Optional[StageTimings]]:
+    # Returns no timings when the answers come from the cache
+    if not options.use_cache:
+        return solve_input(day, options)
+
+    from aoc23.cache import answers_key, get_answers, put_answers
+
+    key = answers_key(day, options_input(day, options), options.strip)
+    if not options.refresh:
+        # A hit never imports the solution
+        cached = get_answers(key)
+        if cached is not None:
+            return cached, None
+
+    answers, timings = solve_input(day, options)
+    put_answers(key, answers)
+    return answers, timings
+
+
+def format_answers(answers: Answers) -> str:
+    # A part without an answer for the input, such as day 8 part 1 on example 3, is
+    # left out
+    return "".join(
+        f"Part {part}: {answer}\n"
+        for part, answer in enumerate(answers, start=1)
+        if answer is not None
+    )
+
+
+def format_timings(timings: Optional[StageTimings]) -> str:
+    if timings is None:
+        return "cached"
+    return ", ".join(f"{stage} {wall * 1000:.3f}ms" for stage, wall in timings.items())
+
+
+def run_day(day: int, options: Options, memory_limited: bool = False) -> DayResult:
+    output = io.StringIO()
+    start = time.perf_counter()
+    try:
+        # Anything printed by the solution is kept with its answers
+        with redirect_stdout(output):
+            answers, timings = solve_cached(day, options)
+        output.write(format_answers(answers))
+        output.write(f"({format_timings(timings)})\n")
+    except Exception as exception:
+        wall = time.perf_counter() - start
+        from aoc23.memory import out_of_memory, release_reserve
+
+        if isinstance(exception, MemoryError) or (
+            memory_limited and out_of_memory(exception)
+        ):
+            release_reserve()
+            return day, output.getvalue(), wall, "exceeded the memory limit", False
+        return day, output.getvalue(), wall, repr(exception), False
+    return day, output.getvalue(), time.perf_counter() - start, None, timings is None
+
+
+def run_days(
+    days: List[int],
+    options: Options,
+    workers: Optional[int] = None,
+    memory_limit: Optional[float] = None,
+) -> bool:
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    timings = load_timings()
+    ordered = schedule(days, timings)
+    results: List[DayResult] = []
+
+    start = time.perf_counter()
+    # The memory limit is set in each worker, and every day gets a new worker, so it
+    # is a limit per day that is not affected by what earlier days left behind
+    initializer = None
+    max_tasks_per_child = None
+    if memory_limit is not None:
+        from aoc23.memory import set_memory_limit
+
+        initializer = partial(set_memory_limit, memory_limit)
+        max_tasks_per_child = 1
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=initializer,
+        max_tasks_per_child=max_tasks_per_child,
+    ) as executor:
+        futures: List[Future[DayResult]] = [
+            executor.submit(run_day, day, options, memory_limit is not None)
+            for day in ordered
+        ]
+        # Print the results as soon as each day is done
+        for future in as_completed(futures):
+            result = future.result()
+            day, output, wall, error, _ = result
+            results.append(result)
+            print(f"Day {day} ({wall:.3f}s)")
+            print(output, end="")
+            if error is not None:
+                print(f"Error: {error}")
+    makespan = time.perf_counter() - start
+
+    print()
+    for day, _, wall, error, cached in sorted(results):
+        status = "failed" if error is not None else "cached" if cached else "ok"
+        print(f"Day {day:>2}: {wall:>9.3f}s {status}")
+    print(f"Total: {sum(wall for _, _, wall, _, _ in results):.3f}s")
+    print(f"Makespan: {makespan:.3f}s")
+
+    # Only computed answers for the problem inputs are representative for scheduling
+    if options.example is None:
+        for day, _, wall, error, cached in results:
+            if error is None and not cached:
+                timings[day] = wall
+        save_timings(timings)
+
+    return all(error is None for _, _, _, error, _ in results)
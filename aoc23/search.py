@@ -0,0 +1,162 @@
+import heapq
+import sys
+from collections import deque
+from typing import Callable, Deque, Iterable, List, NamedTuple, Optional, Tuple
+
+from aoc23.utils import count, count_max
+
+# States are integers in range(size), so distances and visited flags are arrays
+# indexed by state instead of dicts and sets of tuples
+Neighbours = Callable[[int], Iterable[int]]
+# State -> (neighbouring state, cost of moving there)
+WeightedNeighbours = Callable[[int], Iterable[Tuple[int, int]]]
+Goal = Callable[[int], bool]
+Heuristic = Callable[[int], int]
+
+UNREACHED = -1
+INFINITY = sys.maxsize
+
+
+class Stats(NamedTuple):
+    # States taken off the queue and expanded
+    expanded: int
+    # States put on the queue, including the starts
+    pushed: int
+    # Largest number of states on the queue at once
+    max_queue: int
+
+
+def count_stats(name: str, stats: Stats) -> None:
+    # Report the stats of a search to the counters shown by --stats
+    count(f"{name} expanded", stats.expanded)
+    count(f"{name} pushed", stats.pushed)
+    count_max(f"{name} max queue", stats.max_queue)
+
+
+def bfs(
+    starts: Iterable[int],
+    neighbours: Neighbours,
+    size: int,
+    max_depth: Optional[int] = None,
+) -> Tuple[List[int], Stats]:
+    # Distance to every state, UNREACHED for the states that were not reached. States
+    # at max_depth are reached, but not expanded
+    distances = [UNREACHED] * size
+    queue: Deque[int] = deque()
+    for start in starts:
+        if distances[start] == UNREACHED:
+            distances[start] = 0
+            queue.append(start)
+
+    pushed = max_queue = len(queue)
+    expanded = 0
+    while queue:
+        state = queue.popleft()
+        distance = distances[state]
+        if distance == max_depth:
+            continue
+        expanded += 1
+        for neighbour in neighbours(state):
+            if distances[neighbour] == UNREACHED:
+                distances[neighbour] = distance + 1
+                queue.append(neighbour)
+                pushed += 1
+        if len(queue) > max_queue:
+            max_queue = len(queue)
+
+    return distances, Stats(expanded, pushed, max_queue)
+
+
+def astar(
+    starts: Iterable[int],
+    neighbours: WeightedNeighbours,
+    size: int,
+    goal: Goal,
+    heuristic: Heuristic,
+) -> Tuple[Optional[int], Stats]:
+    # Cost of the cheapest path to a goal state, or None if there is none. The
+    # heuristic must never overestimate the remaining cost
+    distances = [INFINITY] * size
+    visited = bytearray(size)
+    # (cost plus heuristic, cost, state)
+    queue: List[Tuple[int, int, int]] = []
+    for start in starts:
+        distances[start] = 0
+        queue.append((heuristic(start), 0, start))
+    heapq.heapify(queue)
+
+    pushed = max_queue = len(queue)
+    expanded = 0
+    while queue:
+        _, cost, state = heapq.heappop(queue)
+        if visited[state]:
+            continue
+        if goal(state):
+            return cost, Stats(expanded, pushed, max_queue)
+        visited[state] = 1
+        expanded += 1
+        for neighbour, weight in neighbours(state):
+            next_cost = cost + weight
+            if next_cost < distances[neighbour]:
+                distances[neighbour] = next_cost
+                heapq.heappush(
+                    queue, (next_cost + heuristic(neighbour), next_cost, neighbour)
+                )
+                pushed += 1
+        if len(queue) > max_queue:
+            max_queue = len(queue)
+
+    return None, Stats(expanded, pushed, max_queue)
+
+
+def dijkstra(
+    starts: Iterable[int], neighbours: WeightedNeighbours, size: int, goal: Goal
+) -> Tuple[Optional[int], Stats]:
+    # A* without a heuristic
+    return astar(starts, neighbours, size, goal, lambda _: 0)
+
+
+def dial(
+    starts: Iterable[int],
+    neighbours: WeightedNeighbours,
+    size: int,
+    goal: Goal,
+    max_weight: int,
+) -> Tuple[Optional[int], Stats]:
+    # Dijkstra with a bucket per cost instead of a heap, for small integer weights.
+    # No queued state costs more than max_weight over the current cost, so a ring
+    # of max_weight + 1 buckets is enough
+    distances = [INFINITY] * size
+    visited = bytearray(size)
+    buckets: List[List[int]] = [[] for _ in range(max_weight + 1)]
+    for start in starts:
+        distances[start] = 0
+        buckets[0].append(start)
+
+    queued = pushed = max_queue = len(buckets[0])
+    expanded = 0
+    cost = 0
+    while queued > 0:
+        bucket = buckets[cost % len(buckets)]
+        while bucket:
+            state = bucket.pop()
+            queued -= 1
+            # Skip states that have been reached cheaper since they were queued
+            if visited[state] or distances[state] < cost:
+                continue
+            if goal(state):
+                return cost, Stats(expanded, pushed, max_queue)
+            visited[state] = 1
+            expanded += 1
+            for neighbour, weight in neighbours(state):
+                next_cost = cost + weight
+                if next_cost < distances[neighbour]:
+                    distances[neighbour] = next_cost
+                    buckets[next_cost % len(buckets)].append(neighbour)
+                    queued += 1
+                    pushed += 1
+            if queued > max_queue:
+                max_queue = queued
+        cost += 1
+
+    return None, Stats(expanded, pushed, max_queue)
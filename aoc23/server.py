@@ -0,0 +1,135 @@
+import asyncio
+import json
+import os
+import signal
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from aoc23.client import default_socket_path
+from aoc23.registry import DAYS, load_solver
+from aoc23.runner import Answers, StageTimings, solve
+
+# Requests are a JSON header line, {"day": 1, "size": 1234, "strip": false},
+# followed by size bytes of input. Every request gets a single JSON line back, with
+# the answers, the timings of the stages and the wall time of the request in the
+# server, or an error
+
+# The largest input a request can send, in bytes
+MAX_REQUEST_SIZE = 1 << 30
+
+
+def warm_up() -> None:
+    # Import every solution once per worker, so requests never pay for it
+    for day in DAYS:
+        load_solver(day)
+
+
+def solve_input(day: int, data: bytes, strip: bool) -> Tuple[Answers, StageTimings]:
+    lines = data.decode().splitlines(keepends=True)
+    if strip:
+        lines = [line.strip() for line in lines]
+    return solve(day, lines)
+
+
+async def handle(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, executor: Executor
+) -> None:
+    loop = asyncio.get_running_loop()
+    try:
+        # A connection can send any number of requests, one after the other
+        while header := await reader.readline():
+            start = time.perf_counter()
+            response: Dict[str, Any]
+            try:
+                request = json.loads(header)
+                day, size = int(request["day"]), int(request["size"])
+                strip = bool(request.get("strip", False))
+                if not 0 <= size <= MAX_REQUEST_SIZE:
+                    raise ValueError(f"size must be 0 to {MAX_REQUEST_SIZE} bytes")
+            except (ValueError, KeyError, TypeError) as exception:
+                # Without a size, the rest of the stream cannot be read
+                response = {"error": f"Invalid request: {exception!r}"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+                break
+
+            data = await reader.readexactly(size)
+            try:
+                answers, timings = await loop.run_in_executor(
+                    executor, solve_input, day, data, strip
+                )
+                response = {"answers": answers, "timings": timings, "error": None}
+            except Exception as exception:
+                response = {"error": repr(exception)}
+            response["wall"] = time.perf_counter() - start
+            # Answers are not always numbers, anything else is sent as a string
+            writer.write(json.dumps(response, default=str).encode() + b"\n")
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+        # Wait for what is buffered to be sent, the client may already be gone
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def serve(path: str, executor: Executor, workers: int) -> None:
+    loop = asyncio.get_running_loop()
+    # Start and warm up all of the workers before accepting the first request
+    await asyncio.gather(
+        *(loop.run_in_executor(executor, warm_up) for _ in range(workers))
+    )
+
+    server = await asyncio.start_unix_server(
+        lambda reader, writer: handle(reader, writer, executor), path
+    )
+    # Stop cleanly on SIGTERM too, so the socket is removed
+    stopped = asyncio.Event()
+    loop.add_signal_handler(signal.SIGTERM, stopped.set)
+    print(f"Serving on {path}", flush=True)
+    async with server:
+        await stopped.wait()
+
+
+def main(argv: List[str]) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m aoc23 serve")
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default="",
+        help="The socket to listen on, defaults to server.sock in the cache directory",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="The number of worker processes, defaults to the number of CPUs",
+    )
+    args = parser.parse_args(argv)
+
+    path = args.socket or default_socket_path()
+    if os.path.exists(path):
+        import socket
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            try:
+                connection.connect(path)
+                raise SystemExit(f"A server is already listening on {path}")
+            except ConnectionRefusedError:
+                # Left behind by a server that did not shut down cleanly
+                os.remove(path)
+
+    workers = args.workers or os.cpu_count() or 1
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=warm_up) as executor:
+            asyncio.run(serve(path, executor, workers))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
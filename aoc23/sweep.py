@@ -0,0 +1,120 @@
+import argparse
+import math
+from typing import Dict, List, Optional, Tuple
+
+from aoc23.bench import format_time, get_stages, time_stage
+from aoc23.generators import GENERATORS, generate
+from aoc23.registry import load_solver
+from aoc23.runner import parse_days
+
+# Times below this are mostly noise, so they are left out of the growth exponent
+MIN_TIME = 0.0002
+
+
+def growth_exponent(points: List[Tuple[int, float]]) -> Optional[float]:
+    # Least squares slope of log(time) against log(input size), so a solver taking
+    # time proportional to n^k has an exponent of about k
+    logs = [
+        (math.log(size), math.log(seconds))
+        for size, seconds in points
+        if seconds >= MIN_TIME
+    ]
+    if len({x for x, _ in logs}) < 2:
+        return None
+    mean_x = sum(x for x, _ in logs) / len(logs)
+    mean_y = sum(y for _, y in logs) / len(logs)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in logs)
+    variance = sum((x - mean_x) ** 2 for x, _ in logs)
+    return covariance / variance
+
+
+def sweep_day(
+    day: int, sizes: List[int], seed: int, repeat: int, max_seconds: float
+) -> None:
+    module = load_solver(day)
+    stages = get_stages(module)
+    # Stage -> (input size in bytes, min time)
+    points: Dict[str, List[Tuple[int, float]]] = {name: [] for name, _, _ in stages}
+
+    print(f"Day {day}")
+    print(f"  {'size':>10} {'bytes':>12}" + "".join(f" {n:>12}" for n, _, _ in stages))
+    for size in sizes:
+        lines = generate(day, size, seed)
+        input_size = sum(len(line) + 1 for line in lines)
+        times: List[str] = []
+        slowest = 0.0
+        for name, setup, function in stages:
+            seconds, _, _ = time_stage(setup, function, lines, 0, repeat)
+            points[name].append((input_size, seconds))
+            times.append(format_time(seconds))
+            slowest = max(slowest, seconds)
+        print(f"  {size:>10} {input_size:>12}" + "".join(f" {t:>12}" for t in times))
+        if slowest > max_seconds:
+            # Larger sizes would only be slower
+            break
+
+    exponents: List[str] = []
+    for name, _, _ in stages:
+        exponent = growth_exponent(points[name])
+        exponents.append("-" if exponent is None else f"n^{exponent:.2f}")
+    print(f"  {'growth':>23}" + "".join(f" {e:>12}" for e in exponents))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m aoc23.sweep")
+    parser.add_argument(
+        "--days",
+        type=str,
+        help="The days to sweep, i.e. 1-12,17. Defaults to all days with a generator",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=str,
+        help="Comma separated input sizes, overrides --scales",
+    )
+    parser.add_argument(
+        "--scales",
+        type=str,
+        default="0.25,0.5,1,2,4",
+        help="Comma separated multiples of the size of the problem input",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="The seed of the input generators",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="The number of timed runs per size, the fastest is used",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=10.0,
+        help="Stop sweeping a day after a stage took longer than this",
+    )
+    args = parser.parse_args()
+
+    days = sorted(GENERATORS) if args.days is None else parse_days(args.days)
+    for day in days:
+        if day not in GENERATORS:
+            print(f"Day {day}: no input generator")
+            continue
+        if args.sizes is not None:
+            sizes = [int(size) for size in args.sizes.split(",")]
+        else:
+            _, default_size = GENERATORS[day]
+            sizes = sorted(
+                {
+                    max(1, round(default_size * float(scale)))
+                    for scale in args.scales.split(",")
+                }
+            )
+        sweep_day(day, sizes, args.seed, args.repeat, args.max_seconds)
+
+
+if __name__ == "__main__":
+    main()
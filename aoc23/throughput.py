@@ -0,0 +1,86 @@
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, Tuple
+
+from aoc23.day1.solution import CHUNK_SIZE, row_calibration_sum, stream_calibration_sum
+from aoc23.generators import generate
+
+MEGABYTE = 1_000_000
+
+
+def write_document(path: str, size: int, seed: int) -> int:
+    # A day 1 calibration document of at least size bytes, made from one generated
+    # block repeated, so generating it does not take longer than solving it
+    block = ("\n".join(generate(1, 10_000, seed)) + "\n").encode()
+    written = 0
+    with open(path, "wb") as file:
+        while written < size:
+            file.write(block)
+            written += len(block)
+    return written
+
+
+def best_time(function: Callable[[], int], repeat: int) -> Tuple[int, float]:
+    answer = 0
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        answer = function()
+        best = min(best, time.perf_counter() - start)
+    return answer, best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m aoc23.throughput")
+    parser.add_argument(
+        "--size",
+        type=float,
+        default=64,
+        help="The size of the generated calibration document in MB",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=CHUNK_SIZE,
+        help="The size of the chunks the bulk mode reads in bytes",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="The seed of the generated document",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="The number of timed runs, the best one is reported",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "calibration.txt")
+        size = write_document(path, int(args.size * MEGABYTE), args.seed)
+
+        def rows() -> int:
+            with open(path) as file:
+                return row_calibration_sum(file.readlines())
+
+        def bulk() -> int:
+            with open(path, "rb") as file:
+                return stream_calibration_sum(file, args.chunk_size)
+
+        print(f"Day 1 part 1 on {size / MEGABYTE:.1f}MB")
+        answers = set()
+        for name, function in (("rows", rows), ("bulk", bulk)):
+            answer, wall = best_time(function, args.repeat)
+            answers.add(answer)
+            print(f"{name:<6} {wall:>8.3f}s {size / MEGABYTE / wall:>9.1f}MB/s")
+        if len(answers) != 1:
+            raise SystemExit(f"The answers differ: {sorted(answers)}")
+
+
+if __name__ == "__main__":
+    main()
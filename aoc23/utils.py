@@ -1,23 +1,519 @@
 import os
-from typing import List, Optional
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import cached_property, wraps
+from itertools import accumulate, pairwise
+from time import perf_counter_ns
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+
+if TYPE_CHECKING:
+    from mmap import mmap
 
 directory = os.path.dirname(os.path.abspath(__file__))
 
+T = TypeVar("T")
+R = TypeVar("R")
+F = TypeVar("F", bound=Callable[..., Any])
 
-def get_input(
-    day: int,
-    example: Optional[int] = None,
-    strip: bool = True,
-) -> List[str]:
+# Maximum size of all cached parsed inputs in bytes, the least recently used ones
+# are evicted first
+PARSED_MAX_SIZE = int(os.environ.get("AOC23_PARSED_CACHE_SIZE", 256 * 1024 * 1024))
+# Maximum number of results shared between the parts of a run, the least recently
+# used ones are evicted first
+RUN_MEMO_SIZE = int(os.environ.get("AOC23_RUN_MEMO_SIZE", 64))
+
+
+# Counters of the work done in hot paths, such as states expanded, only collected
+# while enabled. Solvers count in local variables and report once per call, so
+# counting costs a function call per call of a solver function, not per iteration
+counters: Dict[str, int] = {}
+counters_enabled = False
+
+
+def enable_counters(enabled: bool = True) -> None:
+    global counters_enabled
+    counters_enabled = enabled
+    counters.clear()
+
+
+def counting() -> bool:
+    # For counts that are expensive to compute, so they are only computed if used
+    return counters_enabled
+
+
+def count(name: str, value: int = 1) -> None:
+    if counters_enabled:
+        counters[name] = counters.get(name, 0) + value
+
+
+def count_max(name: str, value: int) -> None:
+    # Keep the largest value, for high-water marks
+    if counters_enabled and value > counters.get(name, value - 1):
+        counters[name] = value
+
+
+# Timed sections of work as (name, start, end) in nanoseconds, only recorded while
+# tracing is enabled
+spans: List[Tuple[str, int, int]] = []
+tracing_enabled = False
+trace_start = 0
+
+
+def enable_tracing(enabled: bool = True) -> None:
+    global tracing_enabled, trace_start
+    tracing_enabled = enabled
+    trace_start = perf_counter_ns()
+    spans.clear()
+
+
+class Span:
+    # A named section of work, as a context manager or as a decorator. Spans that
+    # start inside another span are nested in it in the trace. When tracing is
+    # disabled, a span only costs a check of the flag on entry and exit
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = 0
+
+    def __enter__(self) -> None:
+        if tracing_enabled:
+            self.start = perf_counter_ns()
+
+    def __exit__(self, *exception: object) -> None:
+        if tracing_enabled and self.start:
+            spans.append((self.name, self.start, perf_counter_ns()))
+
+    def __call__(self, function: F) -> F:
+        name = self.name
+
+        @wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not tracing_enabled:
+                return function(*args, **kwargs)
+            # A span per call, so recursive calls do not share their start
+            with Span(name):
+                return function(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+
+def write_trace(path: str) -> None:
+    # Chrome trace event format, for chrome://tracing or https://ui.perfetto.dev.
+    # Complete events are in microseconds since tracing was enabled
+    import json
+
+    pid = os.getpid()
+    events = [
+        {
+            "name": name,
+            "ph": "X",
+            "ts": (start - trace_start) / 1000,
+            "dur": (end - start) / 1000,
+            "pid": pid,
+            "tid": 1,
+        }
+        for name, start, end in spans
+    ]
+    with open(path, "w") as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+
+# (function, identity of the input) -> (input, result). The input is kept alive with
+# its result, so its identity can not be reused by another input
+run_memo: "OrderedDict[Tuple[str, int], Tuple[Any, Any]]" = OrderedDict()
+
+
+def new_run() -> None:
+    # Results are only shared within a run
+    run_memo.clear()
+
+
+def run_cached(function: Callable[[T], R]) -> Callable[[T], R]:
+    # Computes results derived from a parsed input once, so part 1 and part 2 share
+    # them instead of both computing them. Callers must not change the results
+    name = f"{function.__module__}.{function.__qualname__}"
+
+    @wraps(function)
+    def wrapper(input: T) -> R:
+        key = (name, id(input))
+        entry = run_memo.get(key)
+        if entry is not None:
+            run_memo.move_to_end(key)
+            result: R = entry[1]
+            return result
+        result = function(input)
+        run_memo[key] = (input, result)
+        if len(run_memo) > RUN_MEMO_SIZE:
+            run_memo.popitem(last=False)
+        return result
+
+    return wrapper
+
+
+def part_workers() -> int:
+    # Parts that can split their work over processes only do so when opted in, with
+    # --part-workers, as starting the processes costs more than most parts take
+    return int(os.environ.get("AOC23_PART_WORKERS", 0))
+
+
+# Set in the worker processes of a SharedPool: name -> buffer published by the pool,
+# attached from shared memory without copying, and the context of the pool
+shared_buffers: Dict[str, memoryview] = {}
+shared_context: Any = None
+# The attached blocks, so they stay open as long as the worker
+shared_blocks: List[Any] = []
+
+
+def attach_shared(blocks: Dict[str, Tuple[str, str, int]], context: Any) -> None:
+    global shared_context
+    from multiprocessing.shared_memory import SharedMemory
+
+    for name, (block_name, format, size) in blocks.items():
+        # Workers share the resource tracker of the pool, which unlinks the blocks
+        block = SharedMemory(block_name)
+        shared_blocks.append(block)
+        # Blocks are rounded up to pages, so only use the size of the buffer
+        shared_buffers[name] = block.buf[:size].cast(format)
+    shared_context = context
+
+
+class SharedPool:
+    # Worker processes with read-only buffers, such as the cells of a grid, that are
+    # published in shared memory once instead of being pickled for every task.
+    # Functions run by the pool must be importable, they read the buffers from
+    # shared_buffers and the small, picklable context from shared_context
+    def __init__(
+        self,
+        buffers: Dict[str, Union[bytes, bytearray, "array[int]"]],
+        context: Any = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing.shared_memory import SharedMemory
+
+        self.workers = workers or os.cpu_count() or 1
+        self.blocks: List[SharedMemory] = []
+        attached: Dict[str, Tuple[str, str, int]] = {}
+        for name, buffer in buffers.items():
+            view = memoryview(buffer)
+            block = SharedMemory(create=True, size=max(view.nbytes, 1))
+            block.buf[: view.nbytes] = view.cast("B")
+            self.blocks.append(block)
+            attached[name] = (block.name, view.format, view.nbytes)
+        self.executor = ProcessPoolExecutor(
+            self.workers, initializer=attach_shared, initargs=(attached, context)
+        )
+
+    def __enter__(self) -> "SharedPool":
+        return self
+
+    def __exit__(self, *exception: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown()
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+
+    def map_reduce(
+        self,
+        function: Callable[[List[T]], R],
+        tasks: Sequence[T],
+        reduce: Callable[[R, R], R],
+        initial: R,
+        chunk_size: Optional[int] = None,
+    ) -> R:
+        # Runs function on chunks of the tasks and reduces the results, in the order
+        # they complete, so reduce has to be commutative. A few chunks per worker,
+        # so uneven chunks do not leave workers idle at the end
+        from concurrent.futures import as_completed
+
+        if chunk_size is None:
+            chunk_size = max(1, len(tasks) // (self.workers * 4))
+        futures = [
+            self.executor.submit(function, list(tasks[start : start + chunk_size]))
+            for start in range(0, len(tasks), chunk_size)
+        ]
+        result = initial
+        for future in as_completed(futures):
+            result = reduce(result, future.result())
+        return result
+
+
+def cache_directory() -> str:
+    path = os.environ.get("AOC23_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "aoc23"
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def input_path(day: int, example: Optional[int] = None) -> str:
     day_directory = f"{directory}/day{day}"
 
-    filename = (
+    return (
         f"{day_directory}/example{example}.txt"
         if example is not None
         else f"{day_directory}/problem.txt"
     )
-    file = open(filename)
-    lines = file.readlines()
+
+
+def file_digest(path: str) -> str:
+    import hashlib
+
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    # Write to a temporary file first, so concurrent runs never read half an entry
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(data)
+    os.replace(temporary_path, path)
+
+
+def evict(directory: str, max_size: int, suffix: str) -> None:
+    # Remove the least recently used entries until the directory fits in max_size
+    # (last used, size, path)
+    entries: List[Tuple[float, int, str]] = []
+    for entry in os.scandir(directory):
+        if not entry.name.endswith(suffix):
+            continue
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+class Grid:
+    # A grid of characters in one flat bytearray, one byte per cell. The grid is
+    # surrounded by a border of sentinel bytes, so every neighbour of a cell in the
+    # grid is a valid index and lookups never need bounds checks. Cells are
+    # addressed by their index, (x, y) is at (y + 1) * stride + x + 1
+    def __init__(self, lines: Iterable[Union[str, bytes]], border: str = " ") -> None:
+        rows = [
+            line.strip().encode() if isinstance(line, str) else line.strip()
+            for line in lines
+        ]
+        # Blank lines, such as a trailing one, are not rows
+        rows = [row for row in rows if row]
+        self.height = len(rows)
+        self.width = len(rows[0]) if rows else 0
+        if any(len(row) != self.width for row in rows):
+            raise ValueError("All rows of a grid must have the same width")
+
+        self.stride = self.width + 2
+        self.border = ord(border)
+        edge = bytes([self.border])
+        cells = bytearray(edge * self.stride)
+        for row in rows:
+            cells += edge + row + edge
+        cells += edge * self.stride
+        self.cells = cells
+
+        # Offsets to the neighbours of a cell: up, right, down and left
+        self.offsets = (-self.stride, 1, self.stride, -1)
+        # Offsets to all eight surrounding cells
+        self.surrounding = tuple(
+            dy * self.stride + dx
+            for dy in (-1, 0, 1)
+            for dx in (-1, 0, 1)
+            if dx != 0 or dy != 0
+        )
+
+    def index(self, x: int, y: int) -> int:
+        return (y + 1) * self.stride + x + 1
+
+    def coord(self, index: int) -> Tuple[int, int]:
+        y, x = divmod(index, self.stride)
+        return x - 1, y - 1
+
+    def indices(self) -> Iterator[int]:
+        # The indices of the cells in the grid, row by row
+        for y in range(self.height):
+            start = self.index(0, y)
+            yield from range(start, start + self.width)
+
+    def find(self, character: str) -> int:
+        return self.cells.index(ord(character), self.stride)
+
+    def row(self, y: int) -> bytes:
+        start = self.index(0, y)
+        return bytes(self.cells[start : start + self.width])
+
+    def rows(self) -> List[bytes]:
+        return [self.row(y) for y in range(self.height)]
+
+    def columns(self) -> List[bytes]:
+        return [
+            bytes(
+                self.cells[self.index(x, 0) : self.index(x, self.height) : self.stride]
+            )
+            for x in range(self.width)
+        ]
+
+    @cached_property
+    def transposed(self) -> "Grid":
+        # Cached, so only use it on grids that are not changed afterwards
+        return Grid(self.columns(), chr(self.border))
+
+    def copy(self) -> "Grid":
+        grid = Grid.__new__(Grid)
+        grid.__dict__.update(self.__dict__)
+        grid.cells = bytearray(self.cells)
+        # The copy can be changed, so it does not share the cached transpose
+        grid.__dict__.pop("transposed", None)
+        return grid
+
+    def __str__(self) -> str:
+        return "\n".join(row.decode() for row in self.rows())
+
+
+class Integers:
+    # Every integer of an input in one flat array, with the offsets of the rows in
+    # another. Row i is values[offsets[i] : offsets[i + 1]], lines without integers
+    # are empty rows
+    def __init__(self, values: "array[int]", offsets: "array[int]") -> None:
+        self.values = values
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def row(self, index: int) -> List[int]:
+        return self.values[self.offsets[index] : self.offsets[index + 1]].tolist()
+
+    def rows(self) -> Iterator[List[int]]:
+        # Converting all values at once is cheaper than converting every row
+        values = self.values.tolist()
+        for start, stop in pairwise(self.offsets):
+            yield values[start:stop]
+
+
+# Keeps digits, signs and newlines, everything else becomes a space
+INTEGER_TABLE = bytes(
+    byte if byte in b"0123456789-\n" else ord(" ") for byte in range(256)
+)
+
+
+def get_integers(lines: Iterable[str]) -> Integers:
+    # The signed integers of every line, found in the whole input at once. The
+    # input is reduced to digits, signs and whitespace by bytes.translate, so split
+    # finds every number and int parses them, all in C
+    rows = list(map(str.rstrip, lines))
+    data = "\n".join(rows).encode().translate(INTEGER_TABLE)
+    if b"-" in data:
+        # A sign without digits after it is not part of a number, as in
+        # seed-to-soil, and a sign after digits starts a new number
+        data = data.replace(b"-", b" -").replace(b"- ", b"  ").replace(b"-\n", b" \n")
+        data = data.removesuffix(b"-")
+    text = data.decode()
+    values = array("q", map(int, text.split()))
+    counts = map(len, map(str.split, text.split("\n"))) if rows else ()
+    return Integers(values, array("q", accumulate(counts, initial=0)))
+
+
+def cached_parse(
+    parse: Callable[[List[str]], T],
+    lines: Iterable[str],
+    version: str,
+    max_size: int = PARSED_MAX_SIZE,
+) -> T:
+    # Opt-in cache of the parsed input, keyed by the input and the solver version.
+    # The parsed structure is stored with pickle protocol 5
+    import hashlib
+    import pickle
+
+    # The lines are needed twice, for the key and for parsing
+    if not isinstance(lines, list):
+        lines = list(lines)
+    digest = hashlib.sha256(version.encode())
+    for line in lines:
+        digest.update(line.encode())
+        digest.update(b"\0")
+
+    parsed_directory = f"{cache_directory()}/parsed"
+    os.makedirs(parsed_directory, exist_ok=True)
+    path = f"{parsed_directory}/{digest.hexdigest()}.pickle"
+    try:
+        with open(path, "rb") as file:
+            parsed: T = pickle.load(file)
+        # Mark the parsed input as recently used
+        os.utime(path)
+        return parsed
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass
+
+    parsed = parse(lines)
+    atomic_write_bytes(path, pickle.dumps(parsed, protocol=5))
+    evict(parsed_directory, max_size, ".pickle")
+    return parsed
+
+
+def get_file_input(path: str, strip: bool = True) -> List[str]:
+    with open(path) as file:
+        lines = file.readlines()
     if strip:
-        lines = [line.strip() for line in lines]
+        # Strip in place, so there is never a second list of all of the lines
+        for index, line in enumerate(lines):
+            lines[index] = line.strip()
     return lines
+
+
+def get_input(
+    day: int,
+    example: Optional[int] = None,
+    strip: bool = True,
+) -> List[str]:
+    return get_file_input(input_path(day, example), strip)
+
+
+def iter_file_input(path: str, strip: bool = True) -> Iterator[str]:
+    # Lazily read one line at a time, for parsers that only need a single pass
+    with open(path) as file:
+        for line in file:
+            yield line.strip() if strip else line
+
+
+@contextmanager
+def map_file_input(path: str) -> Iterator[Union["mmap", bytes]]:
+    # Memory map the input for byte level solvers. The map is closed when leaving
+    # the block, so any memoryview of it must be released before that
+    import mmap
+
+    with open(path, "rb") as file:
+        # Empty files cannot be mapped
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped